@@ -1,143 +1,469 @@
 # repo_analyzer/cache/sqlite_cache.py
 
 import atexit
+import hashlib
 import json
 import logging
+import os
 import queue
 import sqlite3
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional, Set
+from typing import Any, Dict, Final, FrozenSet, Generator, Iterable, List, Optional, Set, Tuple, Union
+import msgpack
 from colorama import Fore, Style
 
+from repo_analyzer.utils.helpers import usable_cpu_count
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec.msgpack
+except ImportError:
+    msgspec = None
+
+__all__ = [
+    "ConnectionPool",
+    "checkpoint_wal",
+    "clean_cache",
+    "close_all_connections",
+    "flush_pending_writes",
+    "get_cached_entry",
+    "get_connection_context",
+    "get_read_connection_context",
+    "get_valid_file_info",
+    "get_write_connection_context",
+    "initialize_connection_pool",
+    "reset_cache",
+    "set_cached_entries_bulk",
+    "set_cached_entry",
+    "vacuum_cache",
+]
 
 USE_COLOR = sys.stdout.isatty()
+# Colour decided once at import; messages are filled in lazily by logging
+_GREEN_FMT = (Fore.GREEN + "{}" + Style.RESET_ALL) if USE_COLOR else "{}"
+_CACHE_CLEARED_MSG = _GREEN_FMT.format("Cache cleared. %d Entries removed.")
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CONNECTION_POOL_SIZE = 3
-
-class ConnectionPool:
-    """Management of a pool of SQLite connections"""
-
-    _instance_lock = threading.Lock()
-    _instance: Optional['ConnectionPool'] = None
+DEFAULT_CONNECTION_POOL_SIZE: Final[int] = 3
+
+# Page size for newly created cache databases; cached rows carry serialised
+# file info, so larger pages mean fewer overflow pages per lookup
+CACHE_PAGE_SIZE: Final[int] = 8192
+
+# Tuning applied to every connection after WAL has been enabled
+_CONNECTION_PRAGMAS = """
+PRAGMA synchronous = NORMAL;
+PRAGMA busy_timeout = 5000;
+PRAGMA journal_size_limit = 6144000;
+PRAGMA temp_store = MEMORY;
+PRAGMA mmap_size = 268435456;
+"""
+# The writer keeps a large private page cache and never spills dirty pages
+# into the WAL before its batch commits.
+_WRITER_PRAGMAS = """
+PRAGMA cache_size = -65536;
+PRAGMA cache_spill = OFF;
+"""
+# Readers serve pages straight from the shared memory map, so a small private
+# cache each keeps the pool's footprint close to a single copy of the file.
+_READER_PRAGMAS = """
+PRAGMA cache_size = -2048;
+PRAGMA query_only = ON;
+"""
+
+# The writer thread commits queued rows in one transaction once this many
+# have been collected or the flush interval (in seconds) has elapsed.
+WRITE_BATCH_SIZE = 1000
+WRITE_FLUSH_INTERVAL = 0.1
+# Rows that may wait for the writer thread before set_cached_entry blocks
+WRITE_QUEUE_SIZE = 10000
+# Seconds between checks that the writer thread is still alive while a
+# producer or a flush waits on it
+WRITER_LIVENESS_INTERVAL = 1.0
+
+# Upper bound of free pages reclaimed by clean_cache in one pass
+INCREMENTAL_VACUUM_PAGES = 1000
+# Free pages below this count are left for SQLite to reuse on later inserts
+INCREMENTAL_VACUUM_MIN_FREE_PAGES = 256
+# Seconds between background WAL checkpoints; autocheckpoint is disabled
+WAL_CHECKPOINT_INTERVAL = 5.0
+
+# Size of sqlite3's per-connection prepared statement cache (default: 128)
+STATEMENT_CACHE_SIZE = 512
+# Fewer top-level directories than this are scanned sequentially
+PARALLEL_SCAN_MIN_DIRS = 4
+
+_SQL_SELECT: Final = """
+    SELECT file_hash, hash_algorithm, file_info_blob, size, mtime
+    FROM cache WHERE path_hash = ?
+"""
+
+_SQL_SELECT_VALID_INFO: Final = """
+    SELECT file_info_blob FROM cache
+    WHERE path_hash = ? AND size = ? AND mtime = ? AND hash_algorithm = ?
+"""
+
+_SQL_BEGIN: Final = "BEGIN IMMEDIATE"
+_SQL_PING: Final = "SELECT 1"
+_SQL_DELETE_ALL: Final = "DELETE FROM cache"
+_SQL_FREELIST_COUNT: Final = "PRAGMA freelist_count"
+_SQL_VACUUM: Final = "VACUUM"
+
+_SQL_CREATE_KEEP: Final = "CREATE TEMP TABLE _keep (h BLOB PRIMARY KEY) WITHOUT ROWID"
+_SQL_INSERT_KEEP: Final = "INSERT OR IGNORE INTO _keep VALUES (?)"
+_SQL_DELETE_STALE: Final = "DELETE FROM cache WHERE path_hash NOT IN (SELECT h FROM _keep)"
+_SQL_DROP_KEEP: Final = "DROP TABLE _keep"
+
+_SQL_UPSERT: Final = """
+    INSERT INTO cache (
+        path_hash, file_path, file_hash, hash_algorithm, file_info_blob,
+        size, mtime
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path_hash) DO UPDATE SET
+        file_path = excluded.file_path,
+        file_hash = excluded.file_hash,
+        hash_algorithm = excluded.hash_algorithm,
+        file_info_blob = excluded.file_info_blob,
+        size = excluded.size,
+        mtime = excluded.mtime
+"""
+
+_SQL_INCREMENTAL_VACUUM: Final = f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});"
+
+# Prebuilt per mode so checkpointing never formats SQL at run time
+_SQL_WAL_CHECKPOINT: Final[Dict[str, str]] = {
+    mode: f"PRAGMA wal_checkpoint({mode});"
+    for mode in ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+}
+
+
+# msgspec and msgpack both emit standard MessagePack, so rows written by
+# either backend stay readable when the other one is in use
+if msgspec is not None:
+    _encoder = msgspec.msgpack.Encoder()
+    _decoder = msgspec.msgpack.Decoder()
+    _pack_info = _encoder.encode
+    _unpack_info = _decoder.decode
+    _UNPACK_ERRORS: Tuple[type, ...] = (msgspec.DecodeError, ValueError, TypeError)
+else:
+    def _pack_info(file_info: Dict[str, Any]) -> bytes:
+        return msgpack.packb(file_info, use_bin_type=True)
+
+    def _unpack_info(data: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(data, raw=False)
+
+    _UNPACK_ERRORS = (msgpack.UnpackException, ValueError, TypeError)
+
+
+def _loads_info(data: Union[bytes, str]) -> Dict[str, Any]:
+    """Decodes file_info rows written in the legacy JSON format."""
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _path_key(file_path: str) -> bytes:
+    """Returns the fixed-size primary key stored for a file path."""
+    return hashlib.blake2b(
+        file_path.encode("utf-8", "surrogateescape"), digest_size=16
+    ).digest()
+
+
+def _require_absolute(file_path: str) -> None:
+    # Paths are keyed verbatim, so a relative path would never match the
+    # entries written by the directory walk
+    if not os.path.isabs(file_path):
+        raise ValueError(f"Cache entries are keyed by absolute paths, got: {file_path}")
+
+
+# Bumped whenever the layout of the cache table changes;
+# stored in the database via PRAGMA user_version.
+SCHEMA_VERSION = 3
+
+_SQL_CREATE_CACHE: Final = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        path_hash BLOB PRIMARY KEY,
+        file_path TEXT,
+        file_hash TEXT,
+        hash_algorithm TEXT,
+        file_info_blob BLOB,
+        size INTEGER,
+        mtime REAL
+    ) WITHOUT ROWID
+"""
+
+_CACHE_COLUMNS = "file_path, file_hash, hash_algorithm, file_info_blob, size, mtime"
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    """
+    Creates the cache table or migrates an existing one to SCHEMA_VERSION.
+    """
+    version = conn.execute("PRAGMA user_version;").fetchone()[0]
+    table_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cache'"
+    ).fetchone() is not None
+    try:
+        conn.execute(_SQL_BEGIN)
+        if not table_exists:
+            conn.execute(_SQL_CREATE_CACHE.format(table="cache"))
+        else:
+            if version < 1:
+                _migrate_file_info_to_blob(conn)
+            if version < 3:
+                _migrate_to_path_hash_key(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+def _migrate_file_info_to_blob(conn: sqlite3.Connection) -> None:
+    """
+    Moves the JSON encoded file_info column into the MessagePack
+    file_info_blob column and drops the old column afterwards.
+    """
+    logger.info("Migrating the cache database to MessagePack file_info.")
+    conn.execute("ALTER TABLE cache ADD COLUMN file_info_blob BLOB")
+    updates = []
+    for file_path, file_info_json in conn.execute(
+        "SELECT file_path, file_info FROM cache WHERE file_info IS NOT NULL"
+    ):
+        try:
+            updates.append((_pack_info(_loads_info(file_info_json)), file_path))
+        except ValueError:
+            continue
+    conn.executemany(
+        "UPDATE cache SET file_info_blob = ? WHERE file_path = ?", updates
+    )
+    # Rows that could not be converted are dropped and simply re-analysed
+    conn.execute("DELETE FROM cache WHERE file_info_blob IS NULL")
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        conn.execute("ALTER TABLE cache DROP COLUMN file_info")
+    else:
+        conn.execute("UPDATE cache SET file_info = NULL")
+
+
+def _migrate_to_path_hash_key(conn: sqlite3.Connection) -> None:
+    """
+    Rebuilds the cache table as a WITHOUT ROWID table keyed by the 16 byte
+    path hash, which keeps the B-tree far shallower than long path strings.
+    """
+    logger.info("Migrating the cache database to hashed path keys.")
+    conn.create_function("_path_key", 1, _path_key, deterministic=True)
+    conn.execute(_SQL_CREATE_CACHE.format(table="cache_new"))
+    conn.execute(
+        f"INSERT OR REPLACE INTO cache_new (path_hash, {_CACHE_COLUMNS}) "
+        f"SELECT _path_key(file_path), {_CACHE_COLUMNS} FROM cache"
+    )
+    # Nothing queries by hash_algorithm, so its index is not recreated
+    conn.execute("DROP INDEX IF EXISTS idx_hash_algorithm")
+    conn.execute("DROP TABLE cache")
+    conn.execute("ALTER TABLE cache_new RENAME TO cache")
 
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = super(ConnectionPool, cls).__new__(cls)
-        return cls._instance
 
-    def __init__(self, db_path: str, pool_size: Optional[int] = None) -> None:
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-        self.pool_size = pool_size if pool_size is not None else DEFAULT_CONNECTION_POOL_SIZE
-        if not isinstance(self.pool_size, int) or self.pool_size <= 0:
-            logger.error("pool_size must be a positive integer.")
-            sys.exit(1)
-        self.pool = queue.Queue(maxsize=self.pool_size)
+class ConnectionPool:
+    """
+    Management of SQLite connections: a pool of read-only connections
+    for lookups and a single writer connection guarded by a lock.
+    """
+
+    def __init__(self, db_path: str, pool_size: int = DEFAULT_CONNECTION_POOL_SIZE) -> None:
+        if not isinstance(pool_size, int) or isinstance(pool_size, bool):
+            raise TypeError(f"pool_size must be an int, not {type(pool_size).__name__}.")
+        if pool_size <= 0:
+            raise ValueError("pool_size must be a positive integer.")
+        self.pool_size = pool_size
+        self.db_path = db_path
+        # SimpleQueue is implemented in C and has no maxsize bookkeeping,
+        # so a checkout costs less than with queue.Queue
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
         self.pool_lock = threading.Lock()
+        self.write_conn: Optional[sqlite3.Connection] = None
+        self.write_lock = threading.Lock()
         self._initialize_pool(db_path)
-        self._initialized = True
 
     def _initialize_pool(self, db_path: str) -> None:
         with self.pool_lock:
-            for _ in range(self.pool_size):
-                try:
-                    conn = sqlite3.connect(
-                        db_path,
-                        check_same_thread=False
-                    )
-                    conn.execute("PRAGMA foreign_keys = ON;")
-                    conn.execute("PRAGMA journal_mode = WAL;")
-                    conn.execute(
-                        """
-                        CREATE TABLE IF NOT EXISTS cache (
-                            file_path TEXT PRIMARY KEY,
-                            file_hash TEXT,
-                            hash_algorithm TEXT,
-                            file_info TEXT,
-                            size INTEGER,
-                            mtime REAL
-                        )
-                        """
-                    )
-                    conn.execute(
-                        """
-                        CREATE INDEX IF NOT EXISTS idx_hash_algorithm
-                        ON cache(hash_algorithm);
-                        """
-                    )
-                    self.pool.put(conn)
-                except sqlite3.Error as e:
-                    logger.error(
-                        f"Error initialising the database connection: {e}"
-                    )
-                    sys.exit(1)
+            try:
+                # The writer creates the database and schema, so it has to
+                # exist before the read-only connections can be opened.
+                self.write_conn = self._connect_writer()
+                _ensure_schema(self.write_conn)
+                self._prepare_writer_statements(self.write_conn)
+                for _ in range(self.pool_size):
+                    self._release_reader(self._connect_reader())
+            except sqlite3.Error as e:
+                logger.error("Error initialising the database connection: %s", e)
+                raise
             logger.info(
-                f"Database connection pool with {self.pool_size} "
-                "Connections initialised."
+                "Database connection pool with %s read connections "
+                "and one write connection initialised.",
+                self.pool_size,
             )
 
+    def _connect_writer(self) -> sqlite3.Connection:
+        # isolation_level=None: no implicit BEGIN from the sqlite3 module;
+        # every write transaction is opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        # The page size is fixed as soon as the pager reads the database, so
+        # it has to precede any query; on existing databases it is a no-op.
+        conn.execute(f"PRAGMA page_size = {CACHE_PAGE_SIZE};")
+        if conn.execute("PRAGMA page_count;").fetchone()[0] == 0:
+            # auto_vacuum only takes effect on a database without pages,
+            # so it has to be set before WAL mode writes the header.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        # Checkpoints run on a background thread instead of stalling the
+        # commit that happens to cross the autocheckpoint threshold
+        conn.execute("PRAGMA wal_autocheckpoint = 0;")
+        conn.executescript(_CONNECTION_PRAGMAS)
+        conn.executescript(_WRITER_PRAGMAS)
+        return conn
+
+    @staticmethod
+    def _prepare_writer_statements(conn: sqlite3.Connection) -> None:
+        # An empty executemany prepares the statement and places it in the
+        # connection's statement cache without writing a row
+        conn.executemany(_SQL_UPSERT, ())
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        read_only_uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            read_only_uri,
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.executescript(_CONNECTION_PRAGMAS)
+        conn.executescript(_READER_PRAGMAS)
+        # Prepare the lookup up front so the first checkout does not pay for it
+        conn.execute(_SQL_SELECT_VALID_INFO, (b"", 0, 0.0, "")).fetchone()
+        return conn
+
+    def _release_reader(self, conn: sqlite3.Connection) -> None:
+        self._readers.put(conn)
+
     @contextmanager
-    def get_connection_context(self) -> Generator[sqlite3.Connection, None, None]:
-        conn: Optional[sqlite3.Connection] = None
+    def get_read_connection_context(self) -> Generator[sqlite3.Connection, None, None]:
         try:
-            conn = self.pool.get(timeout=10)
-            if not self._validate_connection(conn):
-                logger.warning("Connection is invalid. A new connection is created.")
-                conn = self._create_new_connection(conn)
-            yield conn
+            conn = self._readers.get(timeout=10)
         except queue.Empty:
             logger.error("No available database connections in the pool. Timeout reached.")
-            raise
+            raise TimeoutError("No available database connections in the pool.") from None
+        failed = True
+        try:
+            yield conn
+            failed = False
         finally:
-            if conn:
-                self.pool.put(conn)
+            if failed:
+                # The body may have left the connection broken or holding a
+                # read snapshot; a fresh reader is cheaper than finding out
+                conn = self._create_new_connection(conn)
+            self._release_reader(conn)
+
+    @contextmanager
+    def get_write_connection_context(self) -> Generator[sqlite3.Connection, None, None]:
+        with self.write_lock:
+            if self.write_conn is None:
+                self.write_conn = self._create_new_connection(None, writer=True)
+            try:
+                yield self.write_conn
+            except BaseException:
+                # Never keep a writer with a dangling transaction or one that
+                # no longer answers
+                try:
+                    if self.write_conn.in_transaction:
+                        self.write_conn.rollback()
+                    healthy = self._validate_connection(self.write_conn)
+                except sqlite3.Error:
+                    healthy = False
+                if not healthy:
+                    logger.warning("Write connection is invalid. A new connection is created.")
+                    self.write_conn = self._create_new_connection(
+                        self.write_conn, writer=True
+                    )
+                raise
+
+    def get_connection_context(self):
+        """Kept for backwards compatibility; hands out the writer connection."""
+        return self.get_write_connection_context()
 
     def _validate_connection(self, conn: sqlite3.Connection) -> bool:
+        """Explicit health check; not run on every checkout."""
         try:
-            conn.execute("SELECT 1;")
+            conn.execute(_SQL_PING)
             return True
         except sqlite3.Error:
             return False
 
-    def _create_new_connection(self, old_conn: sqlite3.Connection) -> sqlite3.Connection:
+    def _create_new_connection(
+        self,
+        old_conn: Optional[sqlite3.Connection],
+        writer: bool = False
+    ) -> sqlite3.Connection:
         try:
-            old_conn.close()
-            new_conn = sqlite3.connect(
-                old_conn.database,
-                check_same_thread=False
-            )
-            new_conn.execute("PRAGMA foreign_keys = ON;")
-            new_conn.execute("PRAGMA journal_mode = WAL;")
-            return new_conn
+            if old_conn is not None:
+                old_conn.close()
+            if not writer:
+                return self._connect_reader()
+            conn = self._connect_writer()
+            self._prepare_writer_statements(conn)
+            return conn
         except sqlite3.Error as e:
-            logger.error(f"Error when creating a new database connection: {e}")
-            sys.exit(1)
+            logger.error("Error when creating a new database connection: %s", e)
+            raise
 
     def close_all_connections(self, exclude_conn: Optional[sqlite3.Connection] = None) -> None:
         closed_connections = 0
-        while not self.pool.empty():
+        kept = []
+        while True:
             try:
-                conn = self.pool.get_nowait()
-                if conn != exclude_conn:
-                    conn.close()
-                    closed_connections += 1
-                else:
-                    self.pool.put(conn)
+                conn = self._readers.get_nowait()
             except queue.Empty:
                 break
+            if conn == exclude_conn:
+                kept.append(conn)
+                continue
+            try:
+                conn.close()
+                closed_connections += 1
             except sqlite3.Error as e:
-                logger.error(
-                    f"Error when closing the database connection: {e}"
-                )
+                logger.error("Error when closing the database connection: %s", e)
+        for conn in kept:
+            self._release_reader(conn)
+        with self.write_lock:
+            if self.write_conn is not None and self.write_conn != exclude_conn:
+                try:
+                    self.write_conn.close()
+                    closed_connections += 1
+                except sqlite3.Error as e:
+                    logger.error("Error when closing the database connection: %s", e)
+                self.write_conn = None
         logger.info(
-            f"All {closed_connections} Database connections in the pool have been closed."
+            "All %s Database connections in the pool have been closed.",
+            closed_connections,
         )
 
 
@@ -146,34 +472,240 @@ _connection_pool_instance: Optional[ConnectionPool] = None
 _pool_lock = threading.Lock()
 
 
+# Cache writes are queued for a dedicated writer thread; the bounded queue
+# makes producers wait instead of piling up rows when the disk falls behind
+_write_queue: "queue.Queue[Any]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+_writer_thread: Optional[threading.Thread] = None
+_STOP_WRITER = object()
+_checkpoint_thread: Optional[threading.Thread] = None
+_checkpoint_stop = threading.Event()
+
+
 def initialize_connection_pool(
     db_path: str,
     pool_size: Optional[int] = None
 ) -> None:
+    """
+    Creates the process-wide pool; later calls leave it untouched.
+
+    Raises TypeError or ValueError for an invalid pool_size and
+    sqlite3.Error if the database cannot be opened. Once the pool exists,
+    the check below returns without taking the lock.
+    """
     global _connection_pool_instance
+    if pool_size is None:
+        pool_size = DEFAULT_CONNECTION_POOL_SIZE
     if _connection_pool_instance is None:
         with _pool_lock:
             if _connection_pool_instance is None:
                 _connection_pool_instance = ConnectionPool(db_path, pool_size)
+                _start_writer_thread()
+                _start_checkpoint_thread()
     else:
         logger.info("Connection pool is already initialised.")
 
 
-@contextmanager
-def get_connection_context() -> Generator[sqlite3.Connection, None, None]:
+def _start_writer_thread() -> None:
+    global _writer_thread
+    _writer_thread = threading.Thread(
+        target=_writer_worker,
+        name="cache-writer",
+        daemon=True
+    )
+    _writer_thread.start()
+
+
+def _next_write_batch() -> Tuple[List[Tuple[Any, ...]], Optional[threading.Event], bool]:
+    """
+    Blocks for the next queued row, then gathers more rows for up to
+    WRITE_FLUSH_INTERVAL seconds or WRITE_BATCH_SIZE rows. Stops early at a
+    flush request (an Event) or the stop sentinel.
+    """
+    rows: List[Tuple[Any, ...]] = []
+    item = _write_queue.get()
+    deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+    while True:
+        if item is _STOP_WRITER:
+            return rows, None, True
+        if isinstance(item, threading.Event):
+            return rows, item, False
+        rows.append(item)
+        remaining = deadline - time.monotonic()
+        if len(rows) >= WRITE_BATCH_SIZE or remaining <= 0:
+            return rows, None, False
+        try:
+            item = _write_queue.get(timeout=remaining)
+        except queue.Empty:
+            return rows, None, False
+
+
+def _writer_worker() -> None:
+    while True:
+        rows, flushed, stop = _next_write_batch()
+        try:
+            if rows:
+                _write_rows(rows)
+        except Exception as e:
+            # Keep draining: producers block on the bounded queue, so a dead
+            # writer would hang them
+            logger.error("Error when writing %s cached entries: %r", len(rows), e)
+        finally:
+            if flushed is not None:
+                flushed.set()
+        if stop:
+            return
+
+
+def _writer_alive() -> bool:
+    writer = _writer_thread
+    return writer is not None and writer.is_alive()
+
+
+def _enqueue_write(item: Any) -> None:
+    """
+    Queues an item for the writer thread.
+
+    Raises RuntimeError instead of blocking forever when the queue is full
+    and the writer thread is no longer running to drain it.
+    """
+    while True:
+        try:
+            _write_queue.put(item, timeout=WRITER_LIVENESS_INTERVAL)
+            return
+        except queue.Full:
+            if not _writer_alive():
+                raise RuntimeError("The cache writer thread is not running.") from None
+
+
+def _stop_writer_thread() -> None:
+    global _writer_thread
+    if _writer_thread is None:
+        return
+    try:
+        _enqueue_write(_STOP_WRITER)
+    except RuntimeError:
+        logger.error("The cache writer thread stopped unexpectedly.")
+    _writer_thread.join()
+    _writer_thread = None
+
+
+def _start_checkpoint_thread() -> None:
+    global _checkpoint_thread
+    _checkpoint_stop.clear()
+    _checkpoint_thread = threading.Thread(
+        target=_checkpoint_worker,
+        name="cache-checkpoint",
+        daemon=True
+    )
+    _checkpoint_thread.start()
+
+
+def _checkpoint_worker() -> None:
+    while not _checkpoint_stop.wait(WAL_CHECKPOINT_INTERVAL):
+        checkpoint_wal("PASSIVE")
+
+
+def _stop_checkpoint_thread() -> None:
+    global _checkpoint_thread
+    if _checkpoint_thread is None:
+        return
+    _checkpoint_stop.set()
+    _checkpoint_thread.join()
+    _checkpoint_thread = None
+
+
+def checkpoint_wal(mode: str = "PASSIVE") -> None:
+    """Copies the WAL back into the database file using the given mode."""
+    try:
+        with get_write_connection_context() as conn:
+            conn.execute(_SQL_WAL_CHECKPOINT[mode]).fetchall()
+    except sqlite3.Error as e:
+        logger.error("Error when checkpointing the cache database: %s", e)
+
+
+def flush_pending_writes() -> None:
+    """
+    Blocks until every queued cache entry has been committed.
+
+    While the writer thread runs it is asked to flush and the call waits
+    for it; otherwise, or if the writer dies while waiting, the queue is
+    drained on the calling thread.
+    """
+    if _writer_alive():
+        flushed = threading.Event()
+        try:
+            _enqueue_write(flushed)
+            while not flushed.wait(WRITER_LIVENESS_INTERVAL):
+                if not _writer_alive():
+                    break
+        except RuntimeError:
+            pass
+        if flushed.is_set():
+            return
+        logger.error("The cache writer thread stopped; writing pending entries directly.")
+
+    rows = []
+    while True:
+        try:
+            item = _write_queue.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(item, threading.Event):
+            item.set()
+        elif item is not _STOP_WRITER:
+            rows.append(item)
+    if rows:
+        _write_rows(rows)
+
+
+def _write_rows(rows: List[Tuple[Any, ...]]) -> None:
+    try:
+        with get_write_connection_context() as conn:
+            set_cached_entries_bulk(conn, rows)
+    except sqlite3.Error as e:
+        logger.error("Error when writing %s cached entries: %s", len(rows), e)
+
+
+def _require_pool() -> ConnectionPool:
     if _connection_pool_instance is None:
         logger.error(
             "Connection pool is not initialised. "
             "Please call initialise_connection_pool."
         )
         raise RuntimeError("Connection pool not initialised.")
-    with _connection_pool_instance.get_connection_context() as conn:
+    return _connection_pool_instance
+
+
+@contextmanager
+def get_read_connection_context() -> Generator[sqlite3.Connection, None, None]:
+    with _require_pool().get_read_connection_context() as conn:
+        yield conn
+
+
+@contextmanager
+def get_write_connection_context() -> Generator[sqlite3.Connection, None, None]:
+    with _require_pool().get_write_connection_context() as conn:
+        yield conn
+
+
+@contextmanager
+def get_connection_context() -> Generator[sqlite3.Connection, None, None]:
+    """Backwards compatible alias for :func:`get_write_connection_context`."""
+    with get_write_connection_context() as conn:
         yield conn
 
 
 def close_all_connections(exclude_conn: Optional[sqlite3.Connection] = None) -> None:
+    global _connection_pool_instance
     if _connection_pool_instance is not None:
-        _connection_pool_instance.close_all_connections(exclude_conn)
+        _stop_writer_thread()
+        _stop_checkpoint_thread()
+        flush_pending_writes()
+        # Leave an empty WAL behind so the next run starts from a clean file
+        checkpoint_wal("TRUNCATE")
+        with _pool_lock:
+            _connection_pool_instance.close_all_connections(exclude_conn)
+            _connection_pool_instance = None
     else:
         logger.warning(
             "Connection pool was not initialised. "
@@ -185,32 +717,31 @@ def get_cached_entry(
     conn: sqlite3.Connection,
     file_path: str
 ) -> Optional[Dict[str, Any]]:
-    absolute_file_path = str(Path(file_path).resolve())
+    """
+    Looks up the cache entry for a file.
+
+    The path is used verbatim as the key, so callers pass the absolute path
+    produced by the directory walk; it is not resolved again here. Entries
+    still queued for the writer are visible after flush_pending_writes.
+    Raises ValueError for a relative path.
+    """
+    _require_absolute(file_path)
     try:
-        cursor = conn.execute(
-            """
-            SELECT file_hash, hash_algorithm, file_info, size, mtime
-            FROM cache WHERE file_path = ?
-            """,
-            (absolute_file_path,),
-        )
+        cursor = conn.execute(_SQL_SELECT, (_path_key(file_path),))
         result = cursor.fetchone()
         if result:
-            file_hash, hash_algorithm, file_info_json, size, mtime = result
+            file_hash, hash_algorithm, file_info_blob, size, mtime = result
             try:
-                file_info = json.loads(file_info_json)
+                file_info = _unpack_info(file_info_blob)
                 logger.debug(
-                    f"Cache hit for file: {absolute_file_path} with hash: {file_hash}"
-                )
-            except json.JSONDecodeError as e:
-                logger.error(
-                    f"Error parsing file_info for {absolute_file_path}: {e}"
+                    "Cache hit for file: %s with hash: %s",
+                    file_path,
+                    file_hash,
                 )
-                conn.execute(
-                    "DELETE FROM cache WHERE file_path = ?",
-                    (absolute_file_path,),
-                )
-                conn.commit()
+            except _UNPACK_ERRORS as e:
+                # Lookups run on read-only connections; the broken row is
+                # overwritten by the next set_cached_entry for this file.
+                logger.error("Error parsing file_info for %s: %s", file_path, e)
                 return None
             return {
                 "file_hash": file_hash,
@@ -220,115 +751,238 @@ def get_cached_entry(
                 "mtime": mtime
             }
     except sqlite3.Error as e:
-        logger.error(
-            f"Error when retrieving the cached entry for {absolute_file_path}: {e}"
-        )
+        logger.error("Error when retrieving the cached entry for %s: %s", file_path, e)
     return None
 
 
-def set_cached_entry(
+def get_valid_file_info(
     conn: sqlite3.Connection,
     file_path: str,
+    size: int,
+    mtime: float,
+    hash_algorithm: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached file_info if the entry still matches size, mtime and
+    hash algorithm. Stale entries are filtered out by SQLite, so their
+    file_info is never decoded. Raises ValueError for a relative path.
+    """
+    _require_absolute(file_path)
+    try:
+        row = conn.execute(
+            _SQL_SELECT_VALID_INFO,
+            (_path_key(file_path), size, mtime, hash_algorithm)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.error("Error when retrieving the cached entry for %s: %s", file_path, e)
+        return None
+    if row is None:
+        return None
+    try:
+        file_info = _unpack_info(row[0])
+    except _UNPACK_ERRORS as e:
+        logger.error("Error parsing file_info for %s: %s", file_path, e)
+        return None
+    return file_info
+
+
+def set_cached_entry(
+    conn: Optional[sqlite3.Connection],
+    file_path: str,
     file_hash: Optional[str],
     hash_algorithm: Optional[str],
     file_info: Dict[str, Any],
     size: int,
-    mtime: float
+    mtime: float,
+    flush: bool = False
 ) -> None:
-    absolute_file_path = str(Path(file_path).resolve())
-    file_info_json = json.dumps(file_info)
+    """
+    Stores a cache entry under the absolute path ``file_path``.
+
+    By default the entry is queued and committed by the writer thread
+    together with other pending entries. With ``flush=True`` the
+    entry is written and committed immediately on ``conn``. Raises
+    ValueError for a relative path.
+    """
+    _require_absolute(file_path)
+    row = (
+        _path_key(file_path), file_path, file_hash, hash_algorithm,
+        _pack_info(file_info), size, mtime
+    )
+
+    if not flush:
+        _enqueue_write(row)
+        return
+
+    if conn is None:
+        raise ValueError("A connection is required when flush=True.")
     try:
-        conn.execute(
-            """
-            INSERT INTO cache (
-                file_path, file_hash, hash_algorithm, file_info, size, mtime
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(file_path) DO UPDATE SET
-                file_hash = excluded.file_hash,
-                hash_algorithm = excluded.hash_algorithm,
-                file_info = excluded.file_info,
-                size = excluded.size,
-                mtime = excluded.mtime
-            """,
-            (
-                absolute_file_path, file_hash, hash_algorithm,
-                file_info_json, size, mtime
-            ),
-        )
+        conn.execute(_SQL_UPSERT, row)
         conn.commit()
     except sqlite3.Error as e:
-        logger.error(
-            f"Error when setting the cached entry for {absolute_file_path}: {e}"
-        )
+        logger.error("Error when setting the cached entry for %s: %s", file_path, e)
+
+
+def set_cached_entries_bulk(
+    conn: sqlite3.Connection,
+    rows: Iterable[Tuple[Any, ...]]
+) -> None:
+    """
+    Upserts already encoded cache rows in a single transaction.
+
+    Each row is ``(path_key, absolute_path, file_hash, hash_algorithm,
+    packed_info, size, mtime)`` with ``path_key`` from :func:`_path_key`.
+    The transaction is rolled back and the error re-raised if any row fails.
+    Raises ValueError before writing anything if a path is not absolute.
+    """
+    rows = list(rows)
+    for row in rows:
+        _require_absolute(row[1])
+    try:
+        conn.execute(_SQL_BEGIN)
+        conn.executemany(_SQL_UPSERT, rows)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+def _iter_files(root: Union[str, Path]) -> Generator[str, None, None]:
+    """
+    Yields the path of every file below root using os.scandir.
+
+    Like the traverser, symlinked directories are descended into and paths
+    are kept as walked, so they match the keys written by the file
+    processor. Each linked directory is visited once to avoid cycles.
+    """
+    stack = [os.fspath(root)]
+    visited_links: Set[str] = set()
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if entry.is_symlink():
+                            target = os.path.realpath(entry.path)
+                            if target in visited_links:
+                                continue
+                            visited_links.add(target)
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _scan_files(root: Union[str, Path]) -> FrozenSet[str]:
+    """
+    Collects the paths of all files below root, as the traverser sees them.
+
+    The top-level subdirectories are walked in parallel; roots with only a
+    few of them are walked on the calling thread to skip the pool start-up.
+    """
+    top_files: List[str] = []
+    subdirs: List[str] = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                top_files.append(entry.path)
+
+    if len(subdirs) < PARALLEL_SCAN_MIN_DIRS:
+        return frozenset(chain(top_files, *map(_iter_files, subdirs)))
+
+    workers = min(len(subdirs), usable_cpu_count())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        subtrees = executor.map(lambda d: list(_iter_files(d)), subdirs)
+        return frozenset(chain(top_files, *subtrees))
 
 
 def clean_cache(root_dir: Path) -> None:
-    if _connection_pool_instance is None:
-        logger.error(
-            "Connection pool is not initialised. Please call initialise_connection_pool."
-        )
-        raise RuntimeError("Connection pool not initialised.")
+    _require_pool()
 
-    included_files: Set[str] = set()
     try:
-        for p in root_dir.rglob("*"):
-            if p.is_file():
-                included_files.add(str(p.resolve()))
+        included_files = _scan_files(root_dir)
     except Exception as e:
-        logger.error(f"Error when scanning the root directory {root_dir}: {e}")
+        logger.error("Error when scanning the root directory %s: %s", root_dir, e)
         return
+    # Hash before taking the writer so the lock is only held for SQL
+    keep_keys = frozenset(map(_path_key, included_files))
 
-    with get_connection_context() as conn:
-        try:
-            cursor = conn.execute("SELECT file_path FROM cache")
-            cached_files = {row[0] for row in cursor.fetchall()}
-        except sqlite3.Error as e:
-            logger.error(
-                f"Error when retrieving the cached file paths: {e}"
-            )
-            return
-
-    files_to_remove = cached_files - included_files
-
-    if files_to_remove:
-        try:
-            with get_connection_context() as conn:
+    try:
+        with get_write_connection_context() as conn:
+            # Stage the live path keys in a temp table so SQLite computes the
+            # difference and deletes the stale rows in one statement
+            try:
+                conn.execute(_SQL_BEGIN)
+                conn.execute(_SQL_CREATE_KEEP)
                 conn.executemany(
-                    "DELETE FROM cache WHERE file_path = ?",
-                    ((fp,) for fp in files_to_remove),
+                    _SQL_INSERT_KEEP,
+                    ((key,) for key in keep_keys),
                 )
+                removed = conn.execute(_SQL_DELETE_STALE).rowcount
+                conn.execute(_SQL_DROP_KEEP)
                 conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
 
-                #Only perform VACUUM if a certain number of entries have been removed
-                if len(files_to_remove) >= 10: 
-                    try:
-                        conn.execute("VACUUM;")
-                        logger.info("VACUUM executed, database size reduced.")
-                    except sqlite3.Error as e:
-                        logger.error(f"Error when executing VACUUM: {e}")
-
-            if USE_COLOR:
-                message = (
-                    f"{Fore.GREEN}Cache cleared. "
-                    f"{len(files_to_remove)} Entries removed.{Style.RESET_ALL}"
-                )
-            else:
-                message = (
-                    f"Cache cleared. {len(files_to_remove)} Entries removed."
-                )
-            logger.info(message)
-        except sqlite3.Error as e:
-            logger.error(f"Error when clearing the cache: {e}")
+            if removed:
+                # Reclaim freed pages in a bounded chunk instead of
+                # rewriting the whole file with VACUUM
+                try:
+                    free_pages = conn.execute(_SQL_FREELIST_COUNT).fetchone()[0]
+                    if free_pages >= INCREMENTAL_VACUUM_MIN_FREE_PAGES:
+                        conn.executescript(_SQL_INCREMENTAL_VACUUM)
+                except sqlite3.Error as e:
+                    logger.error("Error when executing incremental vacuum: %s", e)
+    except sqlite3.Error as e:
+        logger.error("Error when clearing the cache: %s", e)
+        return
+
+    if removed:
+        logger.info(_CACHE_CLEARED_MSG, removed)
     else:
         logger.info(
             "No cache clean-up required. All entries are up to date."
         )
 
 
+def vacuum_cache() -> None:
+    """
+    Rebuilds the cache database file with a full VACUUM.
+
+    This rewrites the entire file and blocks all other connections while it
+    runs, so it is only executed on explicit request.
+    """
+    flush_pending_writes()
+    try:
+        with get_write_connection_context() as conn:
+            conn.execute(_SQL_VACUUM)
+        logger.info("VACUUM executed, database size reduced.")
+    except sqlite3.Error as e:
+        logger.error("Error when executing VACUUM: %s", e)
+
+
+def reset_cache() -> None:
+    """
+    Deletes every cache entry so the cache is repopulated from scratch.
+    """
+    _require_pool()
+    flush_pending_writes()
+    try:
+        with get_write_connection_context() as conn:
+            conn.execute(_SQL_DELETE_ALL)
+        logger.info("Cache reset. All entries removed.")
+    except sqlite3.Error as e:
+        logger.error("Error when resetting the cache: %s", e)
+
+
 # Automatic closing of all connections at the end of the programm
 def _shutdown():
     if _connection_pool_instance:
-        _connection_pool_instance.close_all_connections()
+        close_all_connections()
 
 atexit.register(_shutdown)
@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from . import sqlite_cache
+from .sqlite_cache import (
+    SCHEMA_VERSION,
+    clean_cache,
+    close_all_connections,
+    flush_pending_writes,
+    get_cached_entry,
+    get_read_connection_context,
+    get_valid_file_info,
+    initialize_connection_pool,
+    reset_cache,
+    set_cached_entries_bulk,
+    set_cached_entry,
+)
+
+
+class CacheTestCase(unittest.TestCase):
+    """Runs each test against a fresh cache database in a temporary directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.db_path = os.path.join(self.tmp_dir.name, "cache.db")
+
+    def open_pool(self):
+        initialize_connection_pool(self.db_path, pool_size=1)
+        self.addCleanup(close_all_connections)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+
+class TestConnectionPool(CacheTestCase):
+    def test_unopenable_database_raises(self):
+        self.db_path = os.path.join(self.tmp_dir.name, "missing", "cache.db")
+        with self.assertLogs(sqlite_cache.logger, level="ERROR"):
+            with self.assertRaises(sqlite3.Error):
+                sqlite_cache.ConnectionPool(self.db_path, 1)
+
+
+class TestWriterThread(CacheTestCase):
+    def test_writer_survives_a_failing_batch(self):
+        self.open_pool()
+        original = sqlite_cache._write_rows
+        calls = []
+
+        def fail_once(rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise ValueError("boom")
+            original(rows)
+
+        with mock.patch.object(sqlite_cache, "_write_rows", fail_once):
+            with self.assertLogs(sqlite_cache.logger, level="ERROR"):
+                set_cached_entry(None, self.path("a.txt"), "h1", "md5", {"type": "text"}, 1, 1.0)
+                flush_pending_writes()
+            set_cached_entry(None, self.path("b.txt"), "h2", "md5", {"type": "text"}, 2, 2.0)
+            flush_pending_writes()
+
+        self.assertTrue(sqlite_cache._writer_alive())
+        with get_read_connection_context() as conn:
+            self.assertEqual(
+                get_valid_file_info(conn, self.path("b.txt"), 2, 2.0, "md5"), {"type": "text"}
+            )
+
+    def test_enqueue_fails_when_the_writer_is_gone(self):
+        with mock.patch.object(sqlite_cache, "_write_queue", sqlite_cache.queue.Queue(maxsize=1)), \
+                mock.patch.object(sqlite_cache, "WRITER_LIVENESS_INTERVAL", 0.01):
+            sqlite_cache._write_queue.put(object())
+            with self.assertRaises(RuntimeError):
+                set_cached_entry(None, self.path("a.txt"), "h", "md5", {}, 1, 1.0)
+
+
+class TestResetCache(CacheTestCase):
+    def lookup(self, name, size, mtime):
+        with get_read_connection_context() as conn:
+            return get_valid_file_info(conn, self.path(name), size, mtime, "md5")
+
+    def test_updates_after_reset_are_kept(self):
+        self.open_pool()
+        reset_cache()
+        set_cached_entry(None, self.path("a.txt"), "h1", "md5", {"v": 1}, 1, 1.0)
+        set_cached_entry(None, self.path("a.txt"), "h2", "md5", {"v": 2}, 2, 2.0)
+        flush_pending_writes()
+        self.assertEqual(self.lookup("a.txt", 2, 2.0), {"v": 2})
+
+        set_cached_entry(None, self.path("a.txt"), "h3", "md5", {"v": 3}, 3, 3.0)
+        flush_pending_writes()
+        self.assertEqual(self.lookup("a.txt", 3, 3.0), {"v": 3})
+        self.assertIsNone(self.lookup("a.txt", 2, 2.0))
+
+
+class TestRelativePaths(CacheTestCase):
+    def test_every_entry_point_rejects_relative_paths(self):
+        self.open_pool()
+        with get_read_connection_context() as conn:
+            with self.assertRaises(ValueError):
+                get_cached_entry(conn, "a.txt")
+            with self.assertRaises(ValueError):
+                get_valid_file_info(conn, "a.txt", 1, 1.0, "md5")
+        with self.assertRaises(ValueError):
+            set_cached_entry(None, "a.txt", "h", "md5", {}, 1, 1.0)
+        row = (sqlite_cache._path_key("a.txt"), "a.txt", "h", "md5", b"", 1, 1.0)
+        with sqlite_cache.get_write_connection_context() as conn:
+            with self.assertRaises(ValueError):
+                set_cached_entries_bulk(conn, [row])
+
+
+class TestSchemaMigration(CacheTestCase):
+    INFO = {"type": "text", "content": "hello"}
+
+    def setUp(self):
+        super().setUp()
+        self.root = os.path.join(self.tmp_dir.name, "repo")
+        os.makedirs(self.root)
+        self.live = os.path.join(self.root, "live.txt")
+        self.broken = os.path.join(self.root, "broken.txt")
+        for path in (self.live, self.broken):
+            with open(path, "w") as f:
+                f.write("hello")
+        self.deleted = os.path.join(self.root, "deleted.txt")
+
+    def create_db(self, table_sql, rows, user_version):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(table_sql)
+            conn.execute("CREATE INDEX idx_hash_algorithm ON cache(hash_algorithm)")
+            conn.executemany("INSERT INTO cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(f"PRAGMA user_version = {user_version}")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def assert_migrated(self, broken_dropped):
+        self.open_pool()
+        with get_read_connection_context() as conn:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+            self.assertEqual(
+                get_valid_file_info(conn, self.live, 5, 1.0, "md5"), self.INFO
+            )
+            self.assertIsNone(get_valid_file_info(conn, self.live, 6, 1.0, "md5"))
+            entry = get_cached_entry(conn, self.deleted)
+            self.assertEqual(entry["file_hash"], "h2")
+            self.assertEqual(
+                get_cached_entry(conn, self.broken) is None, broken_dropped
+            )
+            self.assertIsNone(conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_hash_algorithm'"
+            ).fetchone())
+
+        clean_cache(self.root)
+        with get_read_connection_context() as conn:
+            self.assertIsNone(get_cached_entry(conn, self.deleted))
+            self.assertEqual(
+                get_valid_file_info(conn, self.live, 5, 1.0, "md5"), self.INFO
+            )
+
+    def test_baseline_schema(self):
+        # Layout before file_info moved to MessagePack (user_version 0)
+        self.create_db(
+            """
+            CREATE TABLE cache (
+                file_path TEXT PRIMARY KEY,
+                file_hash TEXT,
+                hash_algorithm TEXT,
+                file_info TEXT,
+                size INTEGER,
+                mtime REAL
+            )
+            """,
+            [
+                (self.live, "h1", "md5", json.dumps(self.INFO), 5, 1.0),
+                (self.deleted, "h2", "md5", json.dumps(self.INFO), 5, 1.0),
+                (self.broken, "h3", "md5", "{not json", 5, 1.0),
+            ],
+            user_version=0,
+        )
+        self.assert_migrated(broken_dropped=True)
+
+    def test_messagepack_schema_keyed_by_path(self):
+        # Layout with MessagePack file_info but still keyed by the path (user_version 1)
+        packed = sqlite_cache._pack_info(self.INFO)
+        self.create_db(
+            """
+            CREATE TABLE cache (
+                file_path TEXT PRIMARY KEY,
+                file_hash TEXT,
+                hash_algorithm TEXT,
+                file_info_blob BLOB,
+                size INTEGER,
+                mtime REAL
+            )
+            """,
+            [
+                (self.live, "h1", "md5", packed, 5, 1.0),
+                (self.deleted, "h2", "md5", packed, 5, 1.0),
+                (self.broken, "h3", "md5", packed, 5, 1.0),
+            ],
+            user_version=1,
+        )
+        self.assert_migrated(broken_dropped=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
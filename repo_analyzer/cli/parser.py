@@ -2,204 +2,266 @@
 
 import argparse
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Tuple
 import logging
 from repo_analyzer.logging.setup import setup_logging
+from repo_analyzer.traversal.patterns import drop_invalid_patterns
+from repo_analyzer.utils.helpers import usable_cpu_count
 
-# Initialize logging with default settings
-setup_logging(verbose=False)
 logger = logging.getLogger(__name__)
 
+# Output file extension expected for each --format choice
+_FORMAT_EXTENSIONS = MappingProxyType({
+    "json": ".json",
+    "yaml": ".yaml",
+    "xml": ".xml",
+    "ndjson": ".ndjson",
+    "dot": ".dot",
+    "csv": ".csv",
+    "sexp": ".sexp",
+    "msgpack": ".msgpack",
+})
+_FORMAT_CHOICES = tuple(_FORMAT_EXTENSIONS)
+_HASH_CHOICES = ("blake2b", "blake2s", "md5", "sha1", "sha256", "sha512")
+_AUTO_STREAM_FORMATS = ("ndjson", "msgpack")
+_STREAM_FORMATS = ("json", "ndjson", "msgpack")
+
+_DEFAULT_CACHE_PATH = str(Path.cwd() / ".cache")
+
+# Default --threads is usable CPUs * multiplier, capped for very large hosts.
+# Hashing is CPU-bound, so only I/O-bound runs oversubscribe the CPUs.
+_HASHING_THREAD_MULTIPLIER = 1
+_IO_THREAD_MULTIPLIER = 2
+_MAX_DEFAULT_THREADS = 32
+
+def _output_format(value: str) -> Tuple[str, str]:
+    """Resolves a --format value to its name and output file extension."""
+    name = value.lower()
+    extension = _FORMAT_EXTENSIONS.get(name)
+    if extension is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: '{value}' (choose from {', '.join(_FORMAT_CHOICES)})"
+        )
+    return name, extension
+
+def _default_thread_count(hashing: bool) -> int:
+    """Returns the default worker count based on the CPUs this process may use."""
+    multiplier = _HASHING_THREAD_MULTIPLIER if hashing else _IO_THREAD_MULTIPLIER
+    return min(usable_cpu_count() * multiplier, _MAX_DEFAULT_THREADS)
+
 def get_default_cache_path() -> str:
-    return str(Path.cwd() / ".cache")
+    return _DEFAULT_CACHE_PATH
 
-def parse_arguments():
-    parser = argparse.ArgumentParser(
-        description=(
-            "Lists a repository into a JSON, YAML, XML, NDJSON, DOT, "
-            "S-Expressions, MessagePack or CSV file."
-        ),
-        epilog=(
-            "Examples:\\n"
-            "  repo_analyzer /path/to/repo -o output.json\\n"
-            "  repo_analyzer --exclude-folders build dist --include-binary --format yaml\\n"
-            "  repo_analyzer /path/to/repo -o output.ndjson --format ndjson\\n"
-            "  repo_analyzer /path/to/repo -o output.dot --format dot\\n"
-            "  repo_analyzer /path/to/repo -o output.csv --format csv\\n"
-            "  repo_analyzer /path/to/repo -o output.sexp --format sexp\\n"
-            "  repo_analyzer /path/to/repo -o output.xml --format xml\\n"
-            "  repo_analyzer /path/to/repo -o output.msgpack --format msgpack\\n"
-        ),
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    
-    parser.add_argument(
-        "root_directory",
+# (flags, add_argument keyword arguments) for every command line option
+_ARG_SPECS: Tuple[Tuple[Tuple[str, ...], Dict[str, Any]], ...] = (
+    (("root_directory",), dict(
         type=str,
-        help="The root directory of the repository to be analyzed."
-    )
-    
-    parser.add_argument(
-        "-o",
-        "--output",
+        help="The root directory of the repository to be analyzed.",
+    )),
+    (("-o", "--output"), dict(
         type=str,
         required=True,
-        help="Path to the output file."
-    )
-    
-    parser.add_argument(
-        "-f",
-        "--format",
-        choices=["json", "yaml", "xml", "ndjson", "dot", "csv", "sexp", "msgpack"],
+        help="Path to the output file.",
+    )),
+    (("-f", "--format"), dict(
+        type=_output_format,
+        metavar="{" + ",".join(_FORMAT_CHOICES) + "}",
         default="json",
         help="Output file format (default: json).",
-    )
-    
-    parser.add_argument(
-        "--stream",
+    )),
+    (("--stream",), dict(
         action="store_true",
         help="Enables streaming mode for JSON output (automatically enabled for NDJSON and MessagePack).",
-    )
-
-    # Add all your other arguments here...
-    parser.add_argument(
-        "--hash-algorithm",
+    )),
+    (("--hash-algorithm",), dict(
         type=str,
-        choices=["md5", "sha1", "sha256", "sha512"],
-        default="md5",
-        help="Hash algorithm for verification (default: md5)."
-    )
-    
-    parser.add_argument(
-        "--include-binary",
+        choices=_HASH_CHOICES,
+        default="blake2b",
+        help="Hash algorithm for verification (default: blake2b).",
+    )),
+    (("--include-binary",), dict(
         action="store_true",
-        help="Includes binary files and image files in the analysis."
-    )
-    
-    parser.add_argument(
-        "--exclude-folders",
+        help="Includes binary files and image files in the analysis.",
+    )),
+    (("--exclude-folders",), dict(
         nargs='*',
         default=[],
-        help="List of folder names to be excluded from the analysis."
-    )
-    
-    parser.add_argument(
-        "--exclude-files",
+        help="List of folder names to be excluded from the analysis.",
+    )),
+    (("--exclude-files",), dict(
         nargs='*',
         default=[],
-        help="List of file names to be excluded from the analysis."
-    )
-    
-    parser.add_argument(
-        "--follow-symlinks",
+        help="List of file names to be excluded from the analysis.",
+    )),
+    (("--follow-symlinks",), dict(
         action="store_true",
-        help="Follows symbolic links during traversal."
-    )
-    
-    parser.add_argument(
-        "--image-extensions",
+        help="Follows symbolic links during traversal.",
+    )),
+    (("--image-extensions",), dict(
         nargs='*',
         default=[],
-        help="Additional image file extensions to be considered as binary."
-    )
-    
-    parser.add_argument(
-        "--exclude-patterns",
+        help="Additional image file extensions to be considered as binary.",
+    )),
+    (("--exclude-patterns",), dict(
         nargs='*',
         default=[],
-        help="Glob or regex patterns to exclude files and folders."
-    )
-    
-    parser.add_argument(
-        "--threads",
+        help="Glob or regex patterns to exclude files and folders.",
+    )),
+    (("--only-dirs",), dict(
+        nargs='*',
+        default=[],
+        help="Directories inside the root, relative to it or absolute, to restrict "
+             "the analysis to; everything outside them is not traversed.",
+    )),
+    (("--threads",), dict(
         type=int,
         default=None,
-        help="Number of threads for parallel processing (default: CPU cores * 2)."
-    )
-    
-    parser.add_argument(
-        "--encoding",
+        help="Number of threads for parallel processing (default: usable CPU cores, doubled with --no-hash; at most 32).",
+    )),
+    (("--encoding",), dict(
         type=str,
         default=None,
-        help="Default encoding for text files (default: auto detection)."
-    )
-    
-    parser.add_argument(
-        "--verbose",
+        help="Default encoding for text files (default: auto detection).",
+    )),
+    (("--verbose",), dict(
         action="store_true",
-        help="Enables verbose logging."
-    )
-    
-    parser.add_argument(
-        "--log-file",
+        help="Enables verbose logging.",
+    )),
+    (("--log-file",), dict(
         type=str,
         default=None,
-        help="Path to the log file."
-    )
-    
-    parser.add_argument(
-        "--no-hash",
-        action="store_true",
-        help="Disables hash verification."
-    )
-    
-    parser.add_argument(
-        "--config",
+        help="Path to the log file.",
+    )),
+    (("--hash",), dict(
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Enables hash verification; --no-hash disables it.",
+    )),
+    (("--config",), dict(
         type=str,
         default=None,
-        help="Path to the configuration file."
-    )
-    
-    parser.add_argument(
-        "--max-size",
+        help="Path to the configuration file.",
+    )),
+    (("--max-size",), dict(
         type=int,
         default=None,
-        help="Maximum file size to read in MB (overrides configuration file)."
-    )
-    
-    parser.add_argument(
-        "--pool-size",
+        help="Maximum file size to read in MB (overrides configuration file).",
+    )),
+    (("--pool-size",), dict(
         type=int,
         default=5,
-        help="Size of the database connection pool (default: 5)."
-    )
-    
-    parser.add_argument(
-        "--include-summary",
+        help="Size of the database connection pool (default: 5).",
+    )),
+    (("--include-summary",), dict(
         action="store_true",
-        help="Adds a summary of the analysis to the output file."
-    )
-    
-    parser.add_argument(
-        "--cache-path",
+        help="Adds a summary of the analysis to the output file.",
+    )),
+    (("--cache-path",), dict(
         type=str,
-        default=get_default_cache_path(),
-        help="Path to the cache directory (default: ./.cache)."
+        default=_DEFAULT_CACHE_PATH,
+        help="Path to the cache directory (default: ./.cache).",
+    )),
+    (("--vacuum-cache",), dict(
+        action="store_true",
+        help="Rebuilds the cache database with a full VACUUM to reclaim disk space.",
+    )),
+    (("--rebuild-cache",), dict(
+        action="store_true",
+        help="Discards all cache entries and repopulates the cache from scratch.",
+    )),
+)
+
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Lists a repository into a JSON, YAML, XML, NDJSON, DOT, "
+            "S-Expressions, MessagePack or CSV file."
+        ),
+        epilog=(
+            "Examples:\\n"
+            "  repo_analyzer /path/to/repo -o output.json\\n"
+            "  repo_analyzer --exclude-folders build dist --include-binary --format yaml\\n"
+            "  repo_analyzer /path/to/repo -o output.ndjson --format ndjson\\n"
+            "  repo_analyzer /path/to/repo -o output.dot --format dot\\n"
+            "  repo_analyzer /path/to/repo -o output.csv --format csv\\n"
+            "  repo_analyzer /path/to/repo -o output.sexp --format sexp\\n"
+            "  repo_analyzer /path/to/repo -o output.xml --format xml\\n"
+            "  repo_analyzer /path/to/repo -o output.msgpack --format msgpack\\n"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
-    
-    args = parser.parse_args()
+    for flags, options in _ARG_SPECS:
+        parser.add_argument(*flags, **options)
+
+    return parser
+
+def _normalize_only_dirs(
+    parser: argparse.ArgumentParser, root_directory: str, only_dirs: List[str]
+) -> FrozenSet[str]:
+    """
+    Turns --only-dirs into '/'-separated paths relative to the root, the form
+    the traversal compares against. Absolute paths are resolved against the
+    root; paths outside the root are rejected.
+    """
+    root = Path(root_directory).resolve()
+    normalized_dirs = set()
+    for directory in only_dirs:
+        relative = directory
+        if os.path.isabs(directory):
+            try:
+                relative = os.fspath(Path(directory).resolve().relative_to(root))
+            except ValueError:
+                parser.error(f"--only-dirs entry is outside the root directory: {directory}")
+        normalized = os.path.normpath(relative).replace(os.sep, "/").strip("/")
+        if normalized == ".." or normalized.startswith("../"):
+            parser.error(f"--only-dirs entry is outside the root directory: {directory}")
+        if normalized not in ("", "."):
+            normalized_dirs.add(normalized)
+    return frozenset(normalized_dirs)
+
+def parse_arguments():
+    # The parser is built once per process and reused for every call
+    parser = _build_parser()
+    args, extras = parser.parse_known_args()
+    setup_logging(args.verbose, args.log_file)
+
+    # Unrecognised arguments are kept for callers that forward them
+    args.extras = extras
+    if extras:
+        logger.warning("Ignoring unrecognised arguments: %s", ' '.join(extras))
 
     # Validate and fix output extension
-    format_extensions = {
-        "json": ".json",
-        "yaml": ".yaml",
-        "xml": ".xml",
-        "ndjson": ".ndjson",
-        "dot": ".dot",
-        "csv": ".csv",
-        "sexp": ".sexp",
-        "msgpack": ".msgpack"
-    }
-    
-    expected_extension = format_extensions[args.format]
-    output_path = Path(args.output)
-    
-    if output_path.suffix.lower() != expected_extension:
-        args.output = str(output_path.with_suffix(expected_extension))
-        logger.info(f"Adjusted output filename to use correct extension: {args.output}")
+    args.format, expected_extension = args.format
+    base, extension = os.path.splitext(args.output)
+    if extension.lower() != expected_extension:
+        args.output = base + expected_extension
+        logger.info("Adjusted output filename to use correct extension: %s", args.output)
+
+    args.no_hash = not args.hash
+
+    if args.threads is None:
+        args.threads = _default_thread_count(args.hash)
+        logger.debug("Dynamically defined number of threads: %s", args.threads)
+
+    # Freeze the exclusion lists for constant-time membership checks
+    args.exclude_folders = frozenset(args.exclude_folders)
+    args.exclude_files = frozenset(args.exclude_files)
+    args.only_dirs = _normalize_only_dirs(parser, args.root_directory, args.only_dirs)
+    args.image_extensions = frozenset(
+        "." + ext.lstrip(".").lower() for ext in args.image_extensions
+    )
+
+    # Drop invalid regexes with a warning; run() compiles the merged patterns
+    args.exclude_patterns = list(
+        drop_invalid_patterns(args.exclude_patterns, "--exclude-patterns")
+    )
 
     # Automatically enable streaming for NDJSON and MessagePack
-    if args.format in ["ndjson", "msgpack"]:
+    if args.format in _AUTO_STREAM_FORMATS:
         args.stream = True
         if args.format == "ndjson":
             logger.debug("Streaming automatically enabled for NDJSON format")
@@ -207,7 +269,7 @@ def parse_arguments():
             logger.debug("Streaming automatically enabled for MessagePack format")
 
     # Validate streaming mode is only used with supported formats
-    if args.stream and args.format not in ["json", "ndjson", "msgpack"]:
+    if args.stream and args.format not in _STREAM_FORMATS:
         parser.error("--stream is only available for JSON, NDJSON, and MessagePack formats.")
 
     return args
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from . import parser as parser_module
+from .parser import parse_arguments
+
+
+class TestOnlyDirs(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = os.path.realpath(self.tmp_dir.name)
+        patcher = mock.patch.object(parser_module, "setup_logging")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def parse(self, *only_dirs):
+        output = os.path.join(self.root, "out.json")
+        argv = ["repo_analyzer", self.root, "-o", output, "--only-dirs", *only_dirs]
+        with mock.patch("sys.argv", argv):
+            return parse_arguments().only_dirs
+
+    def test_relative_dirs_are_normalised(self):
+        self.assertEqual(
+            self.parse("src/", "./docs", "src/pkg/../lib", "."),
+            frozenset({"src", "docs", "src/lib"}),
+        )
+
+    def test_absolute_dirs_inside_the_root(self):
+        self.assertEqual(
+            self.parse(os.path.join(self.root, "src", "pkg"), self.root),
+            frozenset({"src/pkg"}),
+        )
+
+    def test_dirs_outside_the_root_are_rejected(self):
+        outside = os.path.dirname(self.root)
+        for directory in ("../other", outside):
+            with self.subTest(directory=directory):
+                with mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+                    self.parse(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
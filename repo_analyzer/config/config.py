@@ -1,13 +1,7 @@
 # repo_analyzer/config/config.py
 
-import json
 import logging
-import threading
-from pathlib import Path
-from typing import Any, Dict, Optional, Literal
-
-import yaml
-from colorama import Fore, Style
+from typing import IO, Any, Callable, Dict, FrozenSet, Optional, Tuple
 
 from .defaults import (
     CACHE_DB_FILE,
@@ -19,46 +13,60 @@ from .loader import load_config
 
 
 # Konstanten für unterstützte Dateiformate
-SUPPORTED_FORMATS: tuple[Literal['.yaml', '.yml', '.json'], ...] = (
-    '.yaml',
-    '.yml',
-    '.json',
-)
+SUPPORTED_FORMATS: FrozenSet[str] = frozenset({'.yaml', '.yml', '.json'})
 
 
-def log_error(message: str) -> None:
-    """
-    Helper function to log errors with red colors.
+def _dump_yaml(data: Dict[str, Any], file: IO[str]) -> None:
+    import yaml
+    # Prefer the LibYAML C emitter; fall back to the pure-Python one
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    yaml.dump(data, file, Dumper=dumper, allow_unicode=True, sort_keys=False)
+
+
+def _dump_json(data: Dict[str, Any], file: IO[str]) -> None:
+    # Two-space indentation on both paths: it is the only indent orjson
+    # offers, and saved configs must not depend on whether it is installed
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        try:
+            options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            file.write(orjson.dumps(data, option=options).decode('utf-8'))
+            return
+        except orjson.JSONEncodeError as e:
+            logging.debug("orjson cannot encode the configuration, using json instead: %s", e)
+    import json
+    json.dump(data, file, ensure_ascii=False, indent=2)
 
-    Args:
-        message (str): The error message.
-    """
-    logging.error(f"{Fore.RED}{message}{Style.RESET_ALL}")
 
+# Writer for each supported configuration file suffix
+_DUMPERS: Dict[str, Callable[[Dict[str, Any], IO[str]], None]] = {
+    '.yaml': _dump_yaml,
+    '.yml': _dump_yaml,
+    '.json': _dump_json,
+}
 
-class Config:
+
+class _Config:
     """
-    Singleton class for managing configuration.
+    Holds the configuration data for the running process.
+
+    A single module-level instance, ``config``, is shared by all callers.
     """
 
-    _instance: Optional['Config'] = None
-    _lock: threading.Lock = threading.Lock()
+    __slots__ = ('data', '_max_size')
 
     data: Dict[str, Any]
-
-    def __new__(cls) -> 'Config':
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(Config, cls).__new__(cls)
-        return cls._instance
+    _max_size: Optional[Tuple[Optional[int], int]]
 
     def __init__(self) -> None:
         """
-        Initializes the configuration data if not already done.
+        Initializes empty configuration data.
         """
-        if not hasattr(self, 'data'):
-            self.data = {}
+        self.data = {}
+        self._max_size = None
 
     def load(self, config_path: Optional[str]) -> None:
         """
@@ -70,12 +78,13 @@ class Config:
         if config_path:
             try:
                 loaded_config = load_config(config_path)
-                if isinstance(loaded_config, dict):
-                    self.data.update(loaded_config)
-                else:
+                if not isinstance(loaded_config, dict):
                     raise TypeError("Loaded configuration must be a dictionary.")
+                if loaded_config:
+                    self.data |= loaded_config
+                    self.reset_max_size()
             except Exception as e:
-                log_error(f"Error loading configuration file: {e}")
+                logging.error("Error loading configuration file: %s", e)
 
     def get_max_size(self, cli_max_size: Optional[int]) -> int:
         """
@@ -90,6 +99,21 @@ class Config:
         Raises:
             ValueError: If the provided value is invalid.
         """
+        cached = self._max_size
+        if cached is not None and cached[0] == cli_max_size:
+            return cached[1]
+
+        max_size = self._resolve_max_size(cli_max_size)
+        self._max_size = (cli_max_size, max_size)
+        return max_size
+
+    def reset_max_size(self) -> None:
+        """
+        Discards the cached result of get_max_size.
+        """
+        self._max_size = None
+
+    def _resolve_max_size(self, cli_max_size: Optional[int]) -> int:
         if cli_max_size is not None:
             if cli_max_size <= 0:
                 raise ValueError("The maximum file size must be positive.")
@@ -114,18 +138,21 @@ class Config:
         Args:
             config_path (str): The path to the configuration file.
         """
+        from pathlib import Path
+
         config_file = Path(config_path)
         suffix = config_file.suffix.lower()
 
-        if suffix not in SUPPORTED_FORMATS:
-            log_error(f"Unknown configuration file format for saving: {config_path}")
+        dumper = _DUMPERS.get(suffix)
+        if dumper is None:
+            logging.error("Unknown configuration file format for saving: %s", config_path)
             return
 
         try:
             with config_file.open('w', encoding='utf-8') as file:
-                if suffix in ('.yaml', '.yml'):
-                    yaml.dump(self.data, file, allow_unicode=True, sort_keys=False)
-                elif suffix == '.json':
-                    json.dump(self.data, file, ensure_ascii=False, indent=4)
+                dumper(self.data, file)
         except Exception as e:
-            log_error(f"Error saving configuration file: {e}")
+            logging.error("Error saving configuration file: %s", e)
+
+
+config = _Config()
@@ -1,6 +1,6 @@
 # repo_analyzer/config/defaults.py
 
-DEFAULT_EXCLUDED_FOLDERS = {
+DEFAULT_EXCLUDED_FOLDERS = frozenset({
     'tmp',
     'node_modules',
     '.git',
@@ -26,9 +26,9 @@ DEFAULT_EXCLUDED_FOLDERS = {
     '__pycache__',
     '.mypy_cache'
 
-}
+})
 
-DEFAULT_EXCLUDED_FILES = {
+DEFAULT_EXCLUDED_FILES = frozenset({
     'config.json',
     'secret.txt',
     'package-lock.json',
@@ -36,7 +36,18 @@ DEFAULT_EXCLUDED_FILES = {
     'GeistMonoVF.woff',
     'GeistVF.woff',
     '.repo_structure_cache',
-}
+})
+
+DEFAULT_IMAGE_EXTENSIONS = frozenset({
+    '.png',
+    '.jpg',
+    '.jpeg',
+    '.gif',
+    '.bmp',
+    '.svg',
+    '.webp',
+    '.tiff',
+})
 
 DEFAULT_MAX_FILE_SIZE_MB = 50  #Megabyte
 
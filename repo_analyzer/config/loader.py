@@ -1,25 +1,77 @@
 # repo_analyzer/config/loader.py
 
+import copy
 import json
 import logging
+import os
+import stat
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
-import yaml
-from colorama import Fore, Style
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Constants for supported file extensions
-SUPPORTED_EXTENSIONS = {'.yaml', '.yml', '.json'}
+SUPPORTED_EXTENSIONS = frozenset({'.yaml', '.yml', '.json'})
 
+# Validated configurations keyed by (resolved path, mtime_ns, size)
+_PARSE_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
-def log_error(message: str) -> None:
+
+class _ConfigParseError(ValueError):
+    """Raised by a loader when the configuration file cannot be parsed."""
+
+
+def log_error(message: str, *args: Any) -> None:
     """
-    Logs an error message in red color.
+    Logs an error message; the console formatter renders errors in red.
 
     Args:
-        message (str): The error message.
+        message (str): The error message, with lazy %-style placeholders.
+        *args (Any): Values interpolated into the message when it is emitted.
     """
-    logging.error(f"{Fore.RED}{message}{Style.RESET_ALL}")
+    logging.error(message, *args)
+
+
+def _load_yaml(raw: bytes) -> Any:
+    # PyYAML is only imported once a YAML config is actually loaded
+    import yaml
+    # Prefer the LibYAML C loader; fall back to the pure-Python one
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        # LibYAML detects the encoding of the raw bytes itself
+        return yaml.load(raw, Loader=loader) or {}
+    except yaml.YAMLError as e:
+        raise _ConfigParseError(e) from e
+
+
+def _load_json(raw: bytes) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _validate_max_size(value: Any) -> int:
+    if not isinstance(value, int) or value <= 0:
+        raise ValueError(f"Invalid value for 'max_size' in the configuration file: {value}")
+    return value
+
+
+# Validator for each checked configuration key; invalid entries are removed
+_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    'max_size': _validate_max_size,
+}
+
+
+# Parser for each supported configuration file suffix
+_LOADERS: Dict[str, Callable[[bytes], Any]] = {
+    '.yaml': _load_yaml,
+    '.yml': _load_yaml,
+    '.json': _load_json,
+}
 
 
 def load_config(config_path: Optional[str]) -> Dict[str, Any]:
@@ -37,60 +89,56 @@ def load_config(config_path: Optional[str]) -> Dict[str, Any]:
     if not config_path:
         return {}
 
-    config_file = Path(config_path)
-    if not config_file.is_file():
-        log_error(f"The configuration file does not exist or is not a regular file: {config_path}")
+    try:
+        file_stat = os.stat(config_path)
+    except OSError:
+        file_stat = None
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+        log_error("The configuration file does not exist or is not a regular file: %s", config_path)
+        return {}
+
+    # Only re-parse when the file has changed; callers get their own copy
+    cache_key = (os.path.realpath(config_path), file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    loader = _LOADERS.get(os.path.splitext(config_path)[1].lower())
+    if loader is None:
+        log_error("Unknown configuration file format: %s", config_path)
         return {}
 
     try:
-        with config_file.open('r', encoding='utf-8') as file:
-            file_suffix = config_file.suffix.lower()
-            if file_suffix in ('.yaml', '.yml'):
-                config = yaml.safe_load(file) or {}
-            elif file_suffix == '.json':
-                config = json.load(file)
-            else:
-                log_error(f"Unknown configuration file format: {config_path}")
-                return {}
-    except (yaml.YAMLError, json.JSONDecodeError) as parse_err:
-        log_error(f"Error parsing the configuration file: {parse_err}")
+        config = loader(Path(config_path).read_bytes())
+    except (_ConfigParseError, json.JSONDecodeError) as parse_err:
+        log_error("Error parsing the configuration file: %s", parse_err)
         return {}
     except IOError as io_err:
-        log_error(f"IO error while loading the configuration file: {io_err}")
+        log_error("IO error while loading the configuration file: %s", io_err)
         return {}
     except Exception as e:
-        log_error(f"Unexpected error while loading the configuration file: {e}")
+        log_error("Unexpected error while loading the configuration file: %s", e)
         return {}
 
     # Validation of configuration parameters
-    config = validate_config(config)
-
-    return config
-
-
-def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(config, dict):
+        for key, value in list(config.items()):
+            validator = _VALIDATORS.get(key)
+            if validator is None:
+                continue
+            try:
+                config[key] = validator(value)
+            except ValueError as e:
+                log_error(str(e))
+                del config[key]
+    _PARSE_CACHE[cache_key] = config
+
+    return copy.deepcopy(config)
+
+
+def clear_config_cache() -> None:
     """
-    Validates the loaded configuration parameters.
-
-    Args:
-        config (Dict[str, Any]): The loaded configuration dictionary.
-
-    Returns:
-        Dict[str, Any]: The validated configuration dictionary.
-                        Invalid entries are removed.
+    Discards all cached configurations so the next load re-parses the file.
     """
-    # Validation of the 'max_size' parameter
-    max_size = config.get('max_size')
-    if max_size is not None:
-        if not isinstance(max_size, int) or max_size <= 0:
-            log_error(f"Invalid value for 'max_size' in the configuration file: {max_size}")
-            config.pop('max_size')  # Remove invalid values
-
-    # Additional validations can be added here
-    # Example:
-    # log_level = config.get('log_level')
-    # if log_level not in {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}:
-    #     log_error(f"Invalid value for 'log_level': {log_level}")
-    #     config.pop('log_level')
-
-    return config
+    _PARSE_CACHE.clear()
+
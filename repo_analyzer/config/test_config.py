@@ -0,0 +1,34 @@
+import io
+import sys
+import unittest
+from unittest import mock
+
+from .config import _dump_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class TestDumpJson(unittest.TestCase):
+    def test_output_does_not_depend_on_orjson(self):
+        data = {
+            "max_size": 5,
+            "exclude_folders": ["build", "dist"],
+            "exclude_patterns": ["*.md", "regex:^tmp_"],
+            "encoding": "utf-8",
+            "nested": {"name": "Grüße", "empty": {}, "none": None},
+        }
+        with_orjson = io.StringIO()
+        _dump_json(data, with_orjson)
+        stdlib = io.StringIO()
+        # A None entry in sys.modules makes "import orjson" raise ImportError
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            _dump_json(data, stdlib)
+        self.assertEqual(with_orjson.getvalue(), stdlib.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
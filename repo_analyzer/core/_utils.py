@@ -0,0 +1,15 @@
+# repo_analyzer/core/_utils.py
+
+import logging
+import sys
+from pathlib import Path
+
+
+def initialize_cache_directory(cache_path: Path) -> Path:
+    try:
+        cache_path.mkdir(parents=True, exist_ok=True)
+        logging.debug("Cache directory created or already exists: %s", cache_path)
+    except OSError as e:
+        logging.error("Error when creating the cache directory '%s': %s", cache_path, e)
+        sys.exit(1)
+    return cache_path
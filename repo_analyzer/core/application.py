@@ -2,33 +2,44 @@
 
 import logging
 import signal
-import multiprocessing
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Set, List
+from typing import Any, Dict, FrozenSet, Optional, List, Tuple
 
 from repo_analyzer.cache.sqlite_cache import (
     clean_cache,
     close_all_connections,
-    get_connection_context,
     initialize_connection_pool,
+    reset_cache,
+    vacuum_cache,
 )
 from repo_analyzer.cli.parser import get_default_cache_path, parse_arguments
-from repo_analyzer.config.config import Config
+from repo_analyzer.config.config import config as config_manager
 from repo_analyzer.config.defaults import (
     CACHE_DB_FILE,
     DEFAULT_EXCLUDED_FILES,
     DEFAULT_EXCLUDED_FOLDERS,
+    DEFAULT_IMAGE_EXTENSIONS,
     DEFAULT_MAX_FILE_SIZE_MB
 )
-from repo_analyzer.logging.setup import setup_logging
 from repo_analyzer.output.output_factory import OutputFactory
+from repo_analyzer.traversal.patterns import compile_patterns, drop_invalid_patterns
 from repo_analyzer.traversal.traverser import get_directory_structure, get_directory_structure_stream
 from colorama import init as colorama_init
 
+from ._utils import initialize_cache_directory
 from .flags import shutdown_event
+from .run_config import RunConfig
 
-DEFAULT_THREAD_MULTIPLIER = 2
+def _wait_for_cache_cleanup(cleanup_future: Optional[Future]) -> None:
+    """Waits for the background cache clean-up and logs its failure, if any."""
+    if cleanup_future is None:
+        return
+    try:
+        cleanup_future.result()
+    except Exception as e:
+        logging.error("Error when clearing the cache: %s", e)
 
 def signal_handler(sig, frame):
     if not shutdown_event.is_set():
@@ -38,50 +49,39 @@ def signal_handler(sig, frame):
         logging.warning("Second CTRL+C recognised. Immediate cancellation.")
         sys.exit(1)
 
-def initialize_cache_directory(cache_path: Path) -> Path:
-    try:
-        cache_path.mkdir(parents=True, exist_ok=True)
-        logging.debug(f"Cache directory created or already exists: {cache_path}")
-    except OSError as e:
-        logging.error(f"Error when creating the cache directory '{cache_path}': {e}")
-        sys.exit(1)
-    return cache_path
-
 def run() -> None:
-    colorama_init(autoreset=True)
+    # The autoreset wrapper filters every write; only worth it on a terminal.
+    # Redirected output keeps the stripping set up by utils.color_support.
+    if sys.stdout.isatty():
+        colorama_init(autoreset=True)
     args = parse_arguments()
 
     # Register the global signal handler
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    config_manager = Config()
     try:
         config_manager.load(args.config)
     except FileNotFoundError:
-        logging.error(f"Configuration file not found: {args.config}")
+        logging.error("Configuration file not found: %s", args.config)
         sys.exit(1)
     except Exception as e:
-        logging.error(f"Error loading the configuration file: {e}")
+        logging.error("Error loading the configuration file: %s", e)
         sys.exit(1)
     config = config_manager.data
 
-    setup_logging(args.verbose, args.log_file)
-
     root_directory: Path = Path(args.root_directory).resolve()
     output_file: str = args.output
     include_binary: bool = args.include_binary
-    additional_excluded_folders: Set[str] = set(args.exclude_folders)
-    additional_excluded_files: Set[str] = set(args.exclude_files)
+    additional_excluded_folders: FrozenSet[str] = args.exclude_folders
+    additional_excluded_files: FrozenSet[str] = args.exclude_files
     follow_symlinks: bool = args.follow_symlinks
-    additional_image_extensions: Set[str] = {
-        ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
-        for ext in args.image_extensions
-    }
+    only_dirs: FrozenSet[str] = args.only_dirs
+    additional_image_extensions: FrozenSet[str] = args.image_extensions
     include_summary: bool = args.include_summary
     output_format: str = args.format
     stream_mode: bool = args.stream
-    threads: Optional[int] = args.threads
+    threads: int = args.threads
     exclude_patterns: List[str] = args.exclude_patterns
     encoding: Optional[str] = args.encoding
     cache_path: Path = Path(args.cache_path).expanduser().resolve()
@@ -92,60 +92,73 @@ def run() -> None:
         logging.info("Hash verification is deactivated.")
     else:
         hash_algorithm = args.hash_algorithm
-        logging.info(f"Use hash algorithm: {hash_algorithm}")
-
-    if threads is None:
-        threads = multiprocessing.cpu_count() * DEFAULT_THREAD_MULTIPLIER
-        logging.info(f"Dynamically defined number of threads: {threads}")
+        logging.info("Use hash algorithm: %s", hash_algorithm)
 
     try:
         max_file_size = config_manager.get_max_size(cli_max_size=args.max_size)
-        logging.info(f"Maximum file size for reading: {max_file_size / (1024 * 1024)} MB")
+        logging.info("Maximum file size for reading: %s MB", max_file_size / (1024 * 1024))
     except ValueError as ve:
-        logging.error(f"Error when determining the maximum file size: {ve}")
+        logging.error("Error when determining the maximum file size: %s", ve)
         sys.exit(1)
 
-    config_excluded_folders: Set[str] = set(config.get('exclude_folders', []))
-    config_excluded_files: Set[str] = set(config.get('exclude_files', []))
-    config_exclude_patterns: List[str] = config.get('exclude_patterns', [])
+    # Config patterns get the same per-pattern check as --exclude-patterns
+    config_exclude_patterns: Tuple[str, ...] = drop_invalid_patterns(
+        config.get('exclude_patterns', []), "the configuration file"
+    )
 
-    excluded_folders: Set[str] = (
+    # The defaults are frozensets already; only the small additions are converted
+    excluded_folders: FrozenSet[str] = (
         DEFAULT_EXCLUDED_FOLDERS
-        .union(additional_excluded_folders, config_excluded_folders)
+        | additional_excluded_folders
+        | frozenset(config.get('exclude_folders', ()))
     )
-    excluded_files: Set[str] = (
-        set(DEFAULT_EXCLUDED_FILES)
-        .union(additional_excluded_files, config_excluded_files)
+    excluded_files: FrozenSet[str] = (
+        DEFAULT_EXCLUDED_FILES
+        | additional_excluded_files
+        | frozenset(config.get('exclude_files', ()))
     )
-    exclude_patterns: List[str] = exclude_patterns + config_exclude_patterns
-
-    image_extensions: Set[str] = {
-        '.png',
-        '.jpg',
-        '.jpeg',
-        '.gif',
-        '.bmp',
-        '.svg',
-        '.webp',
-        '.tiff',
-    }.union(additional_image_extensions)
-
-    logging.info(f"Search the directory: {root_directory}")
-    logging.info(f"Excluded folders: {', '.join(sorted(excluded_folders))}")
-    logging.info(f"Excluded files: {', '.join(sorted(excluded_files))}")
-    if not include_binary:
-        logging.info("Binary files and image files are excluded.")
-    else:
-        logging.info("Binary files and image files are included.")
-    logging.info(f"Issue in: {output_file} ({output_format})")
-    logging.info(
-        f"Symbolic links are {'followed' if follow_symlinks else 'not followed'}"
+    exclude_patterns: Tuple[str, ...] = (*exclude_patterns, *config_exclude_patterns)
+
+    image_extensions: FrozenSet[str] = DEFAULT_IMAGE_EXTENSIONS | additional_image_extensions
+
+    # Everything the traversal needs, frozen once and shared by all workers
+    run_config = RunConfig(
+        root_directory=root_directory,
+        max_file_size=max_file_size,
+        include_binary=include_binary,
+        excluded_folders=excluded_folders,
+        excluded_files=excluded_files,
+        follow_symlinks=follow_symlinks,
+        image_extensions=image_extensions,
+        exclude_patterns=exclude_patterns,
+        # One fused regex for all CLI and config patterns, matched once per entry
+        exclude_re=compile_patterns(exclude_patterns),
+        only_dirs=only_dirs,
+        threads=threads,
+        encoding=encoding,
+        hash_algorithm=hash_algorithm,
     )
-    logging.info(f"Image file extensions: {', '.join(sorted(image_extensions))}")
-    logging.info(f"Exclusion pattern: {', '.join(exclude_patterns)}")
-    logging.info(f"Number of threads: {threads}")
-    logging.info(f"Standard encoding: {encoding}")
-    logging.info(f"Cache path: {cache_path}")
+
+    # Sorting and joining the exclusion sets is skipped when INFO is filtered out
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info("Search the directory: %s", root_directory)
+        logging.info("Excluded folders: %s", ', '.join(sorted(excluded_folders)))
+        logging.info("Excluded files: %s", ', '.join(sorted(excluded_files)))
+        if not include_binary:
+            logging.info("Binary files and image files are excluded.")
+        else:
+            logging.info("Binary files and image files are included.")
+        logging.info("Issue in: %s (%s)", output_file, output_format)
+        logging.info(
+            "Symbolic links are %s", 'followed' if follow_symlinks else 'not followed'
+        )
+        logging.info("Image file extensions: %s", ', '.join(sorted(image_extensions)))
+        logging.info("Exclusion pattern: %s", ', '.join(exclude_patterns))
+        if only_dirs:
+            logging.info("Restricted to directories: %s", ', '.join(sorted(only_dirs)))
+        logging.info("Number of threads: %s", threads)
+        logging.info("Standard encoding: %s", encoding)
+        logging.info("Cache path: %s", cache_path)
 
     cache_dir: Path = initialize_cache_directory(cache_path)
     cache_db_path: Path = cache_dir / CACHE_DB_FILE
@@ -153,33 +166,36 @@ def run() -> None:
     try:
         initialize_connection_pool(db_path_str, pool_size=pool_size)
     except Exception as e:
-        logging.error(f"Error when initialising the connection pool: {e}")
+        logging.error("Error when initialising the connection pool: %s", e)
         sys.exit(1)
 
+    # Stale rows are removed in the background while the traversal starts;
+    # they belong to paths that no longer exist, so the two never collide.
+    cleanup_executor: Optional[ThreadPoolExecutor] = None
+    cleanup_future: Optional[Future] = None
     try:
-        clean_cache(root_directory)
+        if args.rebuild_cache:
+            reset_cache()
+        else:
+            cleanup_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="cache-cleanup"
+            )
+            cleanup_future = cleanup_executor.submit(clean_cache, root_directory)
     except Exception as e:
-        logging.error(f"Error when clearing the cache: {e}")
+        logging.error("Error when clearing the cache: %s", e)
         sys.exit(1)
 
+    if args.vacuum_cache:
+        # VACUUM rewrites the whole file, so it has to follow the clean-up
+        _wait_for_cache_cleanup(cleanup_future)
+        vacuum_cache()
+
     try:
         if stream_mode:
             # Use Streaming-Mode
             if output_format in ["json", "ndjson", "msgpack"]:
                 # USE JSON-Streaming or NDJSON-Output or MsgPack-Output
-                data_gen = get_directory_structure_stream(
-                    root_dir=root_directory,
-                    max_file_size=max_file_size,
-                    include_binary=include_binary,
-                    excluded_folders=excluded_folders,
-                    excluded_files=excluded_files,
-                    follow_symlinks=follow_symlinks,
-                    image_extensions=image_extensions,
-                    exclude_patterns=exclude_patterns,
-                    threads=threads,
-                    encoding=encoding,
-                    hash_algorithm=hash_algorithm,
-                )
+                data_gen = get_directory_structure_stream(run_config)
                 output_function = OutputFactory.get_output(output_format, streaming=stream_mode)
                 output_function(data_gen, output_file)
             else:
@@ -187,30 +203,18 @@ def run() -> None:
                 sys.exit(1)
         else:
             # Standardmode
-            structure, summary = get_directory_structure(
-                root_dir=root_directory,
-                max_file_size=max_file_size,
-                include_binary=include_binary,
-                excluded_folders=excluded_folders,
-                excluded_files=excluded_files,
-                follow_symlinks=follow_symlinks,
-                image_extensions=image_extensions,
-                exclude_patterns=exclude_patterns,
-                threads=threads,
-                encoding=encoding,
-                hash_algorithm=hash_algorithm,
-            )
-            # Generate summary
+            structure, summary = get_directory_structure(run_config)
+            # Wrap the structure only when a summary is requested
             output_data: Dict[str, Any] = {
                 "summary": summary,
                 "structure": structure
-            } if include_summary else structure
+            } if include_summary and summary else structure
             OutputFactory.get_output(output_format)(output_data, output_file)
 
         logging.info(
-            f"The current status of the folder structure"
-            f"{' and the summary ' if include_summary else ''}"
-            f" have been saved in'{output_file}'"
+            "The current status of the folder structure%s have been saved in'%s'",
+            ' and the summary ' if include_summary else '',
+            output_file,
         )
     except KeyboardInterrupt:
         if shutdown_event.is_set():
@@ -220,14 +224,17 @@ def run() -> None:
         sys.exit(1)
     except (OSError, IOError) as e:
         logging.error(
-            f"Error when writing the output file after cancellation: {str(e)}"
+            "Error when writing the output file after cancellation: %s", e
         )
         sys.exit(1)
     except ValueError as ve:
-        logging.error(f"Error when selecting the output format: {ve}")
+        logging.error("Error when selecting the output format: %s", ve)
         sys.exit(1)
     finally:
+        _wait_for_cache_cleanup(cleanup_future)
+        if cleanup_executor is not None:
+            cleanup_executor.shutdown()
         try:
             close_all_connections()
         except Exception as e:
-            logging.error(f"Error when closing the connections: {e}")
+            logging.error("Error when closing the connections: %s", e)
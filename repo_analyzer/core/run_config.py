@@ -0,0 +1,28 @@
+# repo_analyzer/core/run_config.py
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import FrozenSet, Optional, Tuple
+
+from repo_analyzer.traversal.patterns import PatternMatcher
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    Settings of one analysis run, resolved once from the CLI arguments and
+    the configuration file and shared read-only by all traversal threads.
+    """
+    root_directory: Path
+    max_file_size: int
+    include_binary: bool
+    excluded_folders: FrozenSet[str]
+    excluded_files: FrozenSet[str]
+    follow_symlinks: bool
+    image_extensions: FrozenSet[str]
+    exclude_patterns: Tuple[str, ...]
+    exclude_re: Optional[PatternMatcher]
+    only_dirs: FrozenSet[str]
+    threads: int
+    encoding: Optional[str]
+    hash_algorithm: Optional[str]
@@ -7,6 +7,29 @@ from typing import Any, Dict, Generator
 from repo_analyzer.utils.time_utils import format_timestamp
 from colorama import Fore, Style
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson only supports two-space indentation; the json fallback uses the same
+# so the layout does not depend on whether orjson is installed. Floats are
+# still formatted by each backend: orjson writes 1e16 and 0.00005 where json
+# writes 1e+16 and 5e-05, and NaN/Infinity become null instead of NaN.
+JSON_INDENT = 2
+
+def _dumps_entry(data: Dict[str, Any]) -> str:
+    """
+    Serialises one streamed JSON value, with orjson when it is installed.
+    The indentation matches the json fallback; floats do not (see JSON_INDENT).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError as e:
+            logging.debug("orjson cannot encode the entry, using json instead: %s", e)
+    return json.dumps(data, ensure_ascii=False, indent=JSON_INDENT)
+
 class JSONStreamWriter:
     """
     Context manager for incrementally writing a JSON file.
@@ -29,12 +52,12 @@ class JSONStreamWriter:
             self.file.write(',\n')
         else:
             self.first_entry = False
-        json.dump(data, self.file, ensure_ascii=False, indent=4)
+        self.file.write(_dumps_entry(data))
 
     def write_summary(self, summary: Dict[str, Any]) -> None:
         self.file.write('\n  ],\n')
         self.file.write('  "summary": ')
-        json.dump(summary, self.file, ensure_ascii=False, indent=4)
+        self.file.write(_dumps_entry(summary))
         self.file.write('\n')
         self.file.write('}\n')
 
@@ -55,10 +78,28 @@ class JSONStreamWriter:
 def output_to_json(data: Dict[str, Any], output_file: str) -> None:
     """
     Writes data in JSON format to a file.
+
+    Uses orjson when it is installed, serialising the whole document in one
+    call and writing it in a single write; otherwise falls back to the json
+    module with the same indentation (see JSON_INDENT for float differences).
     """
     try:
+        if orjson is not None:
+            try:
+                encoded = orjson.dumps(
+                    data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+                )
+            except orjson.JSONEncodeError as e:
+                # e.g. undecodable file names, which the json module still handles
+                logging.debug("orjson cannot encode the output, using json instead: %s", e)
+            else:
+                with open(output_file, 'wb') as out_file:
+                    out_file.write(encoded)
+                return
         with open(output_file, 'w', encoding='utf-8') as out_file:
-            json.dump(data, out_file, ensure_ascii=False, indent=4)
+            json.dump(data, out_file, ensure_ascii=False, indent=JSON_INDENT)
+            out_file.write('\n')
     except Exception as e:
         logging.error(
             f"{Fore.RED}Error writing the JSON output file: {e}{Style.RESET_ALL}"
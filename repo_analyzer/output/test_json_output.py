@@ -0,0 +1,89 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from . import json_output
+from .json_output import output_to_json, output_to_json_stream
+
+
+@unittest.skipIf(json_output.orjson is None, "orjson is not installed")
+class TestJSONOutputBackends(unittest.TestCase):
+    """
+    The layout must not depend on whether orjson is installed; floats are
+    formatted by each backend.
+    """
+
+    def setUp(self):
+        self.data = {
+            "summary": {"total_files": 2, "excluded_percentage": 12.5, "failed_files": []},
+            "structure": {
+                "src": {
+                    "main.py": {"type": "text", "content": "print('ü')\n", "size": 12,
+                                "created": None, "modified": 1700000000.123456},
+                },
+                "empty": {},
+            },
+        }
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _read(self, name):
+        with open(os.path.join(self.tmp_dir.name, name), 'rb') as f:
+            return f.read()
+
+    def test_output_to_json_layout_matches_stdlib(self):
+        output_to_json(self.data, os.path.join(self.tmp_dir.name, "orjson.json"))
+        with mock.patch.object(json_output, "orjson", None):
+            output_to_json(self.data, os.path.join(self.tmp_dir.name, "stdlib.json"))
+        self.assertEqual(self._read("orjson.json"), self._read("stdlib.json"))
+
+    def test_output_to_json_float_formatting(self):
+        data = {"small": 5e-05, "large": 1e16, "nan": math.nan, "inf": math.inf}
+        output_to_json(data, os.path.join(self.tmp_dir.name, "orjson.json"))
+        with mock.patch.object(json_output, "orjson", None):
+            output_to_json(data, os.path.join(self.tmp_dir.name, "stdlib.json"))
+        with_orjson = self._read("orjson.json").decode("utf-8")
+        without_orjson = self._read("stdlib.json").decode("utf-8")
+        self.assertIn('"small": 0.00005', with_orjson)
+        self.assertIn('"small": 5e-05', without_orjson)
+        self.assertIn('"large": 1e16', with_orjson)
+        self.assertIn('"large": 1e+16', without_orjson)
+        self.assertEqual(json.loads(with_orjson)["nan"], None)
+        self.assertTrue(math.isnan(json.loads(without_orjson)["nan"]))
+        self.assertEqual(json.loads(with_orjson)["inf"], None)
+        self.assertEqual(json.loads(without_orjson)["inf"], math.inf)
+
+    def test_output_to_json_stream_layout_matches_stdlib(self):
+        entries = [
+            {"parent": "src", "filename": "main.py", "info": self.data["structure"]["src"]["main.py"]},
+            {"summary": self.data["summary"]},
+        ]
+        output_to_json_stream(iter(entries), os.path.join(self.tmp_dir.name, "orjson.json"))
+        with mock.patch.object(json_output, "orjson", None):
+            output_to_json_stream(iter(entries), os.path.join(self.tmp_dir.name, "stdlib.json"))
+        self.assertEqual(self._read("orjson.json"), self._read("stdlib.json"))
+
+
+    def test_output_to_json_stream_float_formatting(self):
+        entries = [
+            {"parent": "", "filename": "a.bin", "info": {"ratio": 5e-05, "score": math.nan}},
+            {"summary": {"total_bytes": 1e16}},
+        ]
+        output_to_json_stream(iter(entries), os.path.join(self.tmp_dir.name, "orjson.json"))
+        with mock.patch.object(json_output, "orjson", None):
+            output_to_json_stream(iter(entries), os.path.join(self.tmp_dir.name, "stdlib.json"))
+        with_orjson = self._read("orjson.json").decode("utf-8")
+        without_orjson = self._read("stdlib.json").decode("utf-8")
+        self.assertIn('"ratio": 0.00005', with_orjson)
+        self.assertIn('"ratio": 5e-05', without_orjson)
+        self.assertIn('"total_bytes": 1e16', with_orjson)
+        self.assertIn('"total_bytes": 1e+16', without_orjson)
+        self.assertIsNone(json.loads(with_orjson)["structure"][0]["info"]["score"])
+        self.assertTrue(math.isnan(json.loads(without_orjson)["structure"][0]["info"]["score"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
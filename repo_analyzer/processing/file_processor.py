@@ -4,7 +4,11 @@ import os
 from pathlib import Path
 from typing import Any, Dict, Optional, Set, Tuple, Union
 
-from ..cache.sqlite_cache import get_cached_entry, set_cached_entry, get_connection_context
+from ..cache.sqlite_cache import (
+    get_read_connection_context,
+    get_valid_file_info,
+    set_cached_entry,
+)
 from ..processing.hashing import compute_file_hash
 from ..utils.mime_type import is_binary
 
@@ -18,7 +22,7 @@ def process_file(
     include_binary: bool,
     image_extensions: Set[str],
     encoding: Optional[str] = None,
-    hash_algorithm: Optional[str] = "md5",
+    hash_algorithm: Optional[str] = "blake2b",
 ) -> Tuple[str, Optional[Dict[str, Any]]]:
     filename = file_path.name
 
@@ -56,7 +60,7 @@ def process_file(
         if isinstance(file_hash, dict) and file_hash.get("type") == "error":
             return filename, file_hash
 
-    file_info = _process_file_content(file_path, include_binary, image_extensions, max_file_size, encoding)
+    file_info = _process_file_content(file_path, include_binary, image_extensions, max_file_size, encoding, current_size)
     if file_info.get("type") in ["error", "excluded"]:
         return filename, file_info
 
@@ -68,23 +72,14 @@ def process_file(
     return filename, file_info
 
 def _check_cache(file_path: Path, current_size: int, current_mtime: float, hash_algorithm: str) -> Optional[Dict[str, Any]]:
-    with get_connection_context() as conn:
-        cached_entry = get_cached_entry(conn, str(file_path.resolve()))
-
-    if cached_entry:
-        cached_size = cached_entry.get("size")
-        cached_mtime = cached_entry.get("mtime")
-        cached_algorithm = cached_entry.get("hash_algorithm")
-
-        if (
-            cached_size == current_size and
-            cached_mtime == current_mtime and
-            cached_algorithm == hash_algorithm
-        ):
-            logger.debug(f"Cache hit for file: {file_path}")
-            return cached_entry.get("file_info")
+    with get_read_connection_context() as conn:
+        file_info = get_valid_file_info(
+            conn, os.fspath(file_path), current_size, current_mtime, hash_algorithm
+        )
 
-    return None
+    if file_info is not None:
+        logger.debug(f"Cache hit for file: {file_path}")
+    return file_info
 
 def _compute_hash(file_path: Path, hash_algorithm: str) -> Union[str, Dict[str, Any]]:
     try:
@@ -98,7 +93,7 @@ def _compute_hash(file_path: Path, hash_algorithm: str) -> Union[str, Dict[str,
             "exception_message": str(e)
         }
 
-def _process_file_content(file_path: Path, include_binary: bool, image_extensions: Set[str], max_file_size: int, encoding: str) -> Dict[str, Any]:
+def _process_file_content(file_path: Path, include_binary: bool, image_extensions: Set[str], max_file_size: int, encoding: str, file_size: int) -> Dict[str, Any]:
     file_extension = file_path.suffix.lower()
     is_image = file_extension in image_extensions
 
@@ -113,7 +108,7 @@ def _process_file_content(file_path: Path, include_binary: bool, image_extension
             }
 
         if binary:
-            return _read_binary_file(file_path, max_file_size)
+            return _read_binary_file(file_path, file_size, max_file_size)
         else:
             return _read_text_file(file_path, max_file_size, encoding)
 
@@ -148,9 +143,9 @@ def _process_file_content(file_path: Path, include_binary: bool, image_extension
             "exception_message": str(e)
         }
 
-def _read_binary_file(file_path: Path, max_file_size: int) -> Dict[str, Any]:
+def _read_binary_file(file_path: Path, file_size: int, max_file_size: int) -> Dict[str, Any]:
+    # file_size comes from the stat in process_file, no second stat() per file
     try:
-        file_size = file_path.stat().st_size
         if file_size > max_file_size:
             logger.info(f"Binary file too large to include: {file_path} ({file_size} bytes)")
             return {
@@ -160,7 +155,7 @@ def _read_binary_file(file_path: Path, max_file_size: int) -> Dict[str, Any]:
             }
         
         with open(file_path, 'rb') as f:
-            content = base64.b64encode(f.read()).decode('utf-8')
+            content = base64.b64encode(f.read(max_file_size)).decode('utf-8')
         logger.debug(f"Included binary file: {file_path}")
         return {
             "type": "binary",
@@ -223,13 +218,13 @@ def _add_metadata(file_info: Dict[str, Any], stat: os.stat_result) -> None:
         logger.warning(f"Could not retrieve complete metadata: {e}")
 
 def _update_cache(file_path: Path, file_hash: str, hash_algorithm: str, file_info: Dict[str, Any], current_size: int, current_mtime: float) -> None:
-    with get_connection_context() as conn:
-        set_cached_entry(
-            conn,
-            str(file_path.resolve()),
-            file_hash,
-            hash_algorithm,
-            file_info,
-            current_size,
-            current_mtime
-        )
+    # Queued write; the cache's writer thread commits it in a batch
+    set_cached_entry(
+        None,
+        os.fspath(file_path),
+        file_hash,
+        hash_algorithm,
+        file_info,
+        current_size,
+        current_mtime
+    )
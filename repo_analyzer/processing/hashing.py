@@ -7,19 +7,16 @@ from typing import Optional
 
 # Optional: Keep color highlighting in logs
 # If colors are not needed, the following lines can be removed
-from colorama import Fore, Style, init
+from colorama import Fore, Style
 
-# Initialize colorama
-init(autoreset=True)
 
-
-def compute_file_hash(file_path: Path, algorithm: str = "sha256") -> Optional[str]:
+def compute_file_hash(file_path: Path, algorithm: str = "blake2b") -> Optional[str]:
     """Calculates the hash of a file based on the specified algorithm.
 
     Args:
         file_path (Path): The path to the file.
-        algorithm (str, optional): The hash algorithm (e.g., 'md5', 'sha1', 'sha256'). 
-                                   Default is 'sha256'.
+        algorithm (str, optional): The hash algorithm (e.g., 'blake2b', 'md5', 'sha256'). 
+                                   Default is 'blake2b'.
 
     Returns:
         Optional[str]: The file's hash as a hex string or None in case of errors.
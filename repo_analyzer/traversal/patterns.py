@@ -2,12 +2,103 @@
 
 import fnmatch
 import logging
+import os
 import re
+import threading
 from functools import lru_cache
-from typing import Pattern, Sequence
+from typing import List, Optional, Pattern, Sequence, Tuple, Union
 
 from colorama import Fore, Style
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+class HyperscanMatcher:
+    """
+    Matches names against a Hyperscan multi-pattern database.
+
+    Exposes the ``match`` method of a compiled regex so the traversal can use
+    either interchangeably; every expression is anchored like ``re.match``.
+    The expressions are compiled in UTF-8/Unicode mode so ``.``, ``?`` and
+    ``\\w`` see characters, not bytes, as they do with ``re``. Names that are
+    not valid UTF-8 (undecodable file names) are matched by ``fallback``.
+    """
+
+    __slots__ = ('_database', '_local', '_fallback')
+
+    def __init__(self, sources: Sequence[str], fallback: Pattern) -> None:
+        count = len(sources)
+        flags = (
+            hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_ALLOWEMPTY
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+        )
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=[f"^(?:{source})".encode('utf-8') for source in sources],
+            ids=list(range(count)),
+            elements=count,
+            flags=[flags] * count,
+        )
+        self._fallback = fallback
+        # Scratch space may only be used by one scan at a time
+        self._local = threading.local()
+
+    def match(self, name: str) -> bool:
+        try:
+            data = name.encode('utf-8')
+        except UnicodeEncodeError:
+            # UTF-8 mode requires valid UTF-8 input
+            return self._fallback.match(name) is not None
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._database)
+        matched: List[bool] = []
+
+        def on_match(*_: object) -> None:
+            matched.append(True)
+
+        self._database.scan(data, match_event_handler=on_match, scratch=scratch)
+        return bool(matched)
+
+
+class CombinedMatcher:
+    """
+    Matches names against a fused matcher plus patterns checked one by one.
+
+    Patterns with capture groups or global inline flags cannot be joined into
+    one alternation without changing their meaning (group numbers shift,
+    ``(?i)`` must lead the expression, named groups collide), so they are
+    matched separately with their own compiled regex.
+    """
+
+    __slots__ = ('_fused', '_separate')
+
+    def __init__(self, fused: Optional["PatternMatcher"], separate: Sequence[Pattern]) -> None:
+        self._fused = fused
+        self._separate = tuple(separate)
+
+    def match(self, name: str) -> bool:
+        if self._fused is not None and self._fused.match(name):
+            return True
+        return any(pattern.match(name) for pattern in self._separate)
+
+
+# A fused regex, a Hyperscan database when the optional package is installed,
+# or a combination with the patterns that had to stay separate
+PatternMatcher = Union[Pattern, HyperscanMatcher, CombinedMatcher]
+
+# Flags of a pattern compiled without inline flags
+_DEFAULT_FLAGS = re.compile('').flags
+
+# fnmatch.fnmatch compares os.path.normcase'd names, so globs ignore case
+# on platforms with case-insensitive paths such as Windows
+_CASE_INSENSITIVE_GLOBS = os.path.normcase('A') == 'a'
+
 @lru_cache(maxsize=None)
 def compile_regex(pattern: str) -> Pattern:
     """
@@ -21,29 +112,116 @@ def compile_regex(pattern: str) -> Pattern:
     """
     return re.compile(pattern)
 
-def matches_patterns(filename: str, patterns: Sequence[str]) -> bool:
+def _pattern_to_regex(pattern: str) -> Optional[str]:
     """
-    Checks if the filename matches any of the patterns (Glob or Regex).
+    Converts a single Glob or ``regex:`` pattern into regex source.
 
     Args:
-        filename (str): The name of the file.
-        patterns (Sequence[str]): A sequence of patterns (Glob or Regex).
+        pattern (str): The pattern (Glob or Regex).
 
     Returns:
-        bool: True if the filename matches any of the patterns, otherwise False.
+        Optional[str]: The regex source, or None if the regex is invalid.
+    """
+    if pattern.startswith('regex:'):
+        regex: str = pattern[len('regex:'):]
+        try:
+            compile_regex(regex)
+        except re.error as e:
+            logging.error(
+                "%sInvalid regex pattern '%s': %s%s", Fore.RED, regex, e, Style.RESET_ALL
+            )
+            return None
+        return regex
+    source = fnmatch.translate(pattern)
+    if _CASE_INSENSITIVE_GLOBS:
+        # A scoped flag keeps the glob fusable with the other patterns
+        return f"(?i:{source})"
+    return source
+
+def drop_invalid_patterns(patterns: Sequence[str], origin: str) -> Tuple[str, ...]:
     """
+    Returns the patterns whose ``regex:`` part compiles, warning about the rest.
+
+    Args:
+        patterns (Sequence[str]): The patterns (Glob or Regex).
+        origin (str): Where the patterns come from, used in the warning.
+
+    Returns:
+        Tuple[str, ...]: The usable patterns in their original order.
+    """
+    valid = []
     for pattern in patterns:
         if pattern.startswith('regex:'):
-            regex: str = pattern[len('regex:'):]
             try:
-                compiled: Pattern = compile_regex(regex)
-                if compiled.match(filename):
-                    return True
+                compile_regex(pattern[len('regex:'):])
             except re.error as e:
-                logging.error(
-                    f"{Fore.RED}Invalid regex pattern '{regex}': {e}{Style.RESET_ALL}"
-                )
+                logging.warning("Ignoring invalid regex in %s '%s': %s", origin, pattern, e)
+                continue
+        valid.append(pattern)
+    return tuple(valid)
+
+def _is_fusable(compiled: Pattern) -> bool:
+    """Whether a pattern keeps its meaning inside a ``(?:...)|(?:...)`` alternation."""
+    return compiled.groups == 0 and compiled.flags == _DEFAULT_FLAGS
+
+@lru_cache(maxsize=None)
+def compile_patterns(patterns: Tuple[str, ...]) -> Optional[PatternMatcher]:
+    """
+    Fuses Glob and Regex patterns into a single matcher.
+
+    Globs are translated with fnmatch and keep their full-match semantics
+    and, like fnmatch.fnmatch, ignore case where paths do, regexes keep the ``re.match`` semantics of the per-pattern check. Invalid
+    regexes are logged once and left out. Patterns with capture groups or
+    global inline flags are matched on their own; all others are joined into
+    one regex, or into one Hyperscan database when Hyperscan is installed.
+
+    Args:
+        patterns (Tuple[str, ...]): The patterns (Glob or Regex).
+
+    Returns:
+        Optional[PatternMatcher]: The matcher, or None if nothing can match.
+    """
+    fusable: List[Pattern] = []
+    separate: List[Pattern] = []
+    for source in map(_pattern_to_regex, patterns):
+        if source is None:
+            continue
+        compiled = compile_regex(source)
+        (fusable if _is_fusable(compiled) else separate).append(compiled)
+
+    fused: Optional[PatternMatcher] = None
+    if len(fusable) == 1:
+        fused = fusable[0]
+    elif fusable:
+        try:
+            fused = re.compile("|".join(f"(?:{p.pattern})" for p in fusable))
+        except re.error as e:
+            logging.debug("Cannot fuse the exclude patterns, matching them one by one: %s", e)
+            separate[:0] = fusable
         else:
-            if fnmatch.fnmatch(filename, pattern):
-                return True
-    return False
+            if hyperscan is not None:
+                try:
+                    fused = HyperscanMatcher([p.pattern for p in fusable], fused)
+                except hyperscan.error as e:
+                    # Syntax Hyperscan does not support stays with re
+                    logging.debug("Hyperscan cannot compile the patterns, using re instead: %s", e)
+
+    if not separate:
+        return fused
+    return CombinedMatcher(fused, separate)
+
+def matches_patterns(filename: str, patterns: Sequence[str]) -> bool:
+    """
+    Checks if the filename matches any of the patterns (Glob or Regex).
+
+    Args:
+        filename (str): The name of the file.
+        patterns (Sequence[str]): A sequence of patterns (Glob or Regex).
+
+    Returns:
+        bool: True if the filename matches any of the patterns, otherwise False.
+    """
+    if not patterns:
+        return False
+    fused = compile_patterns(tuple(patterns))
+    return fused is not None and bool(fused.match(filename))
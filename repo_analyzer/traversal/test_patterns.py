@@ -0,0 +1,78 @@
+import re
+import unittest
+from unittest import mock
+
+from . import patterns as patterns_module
+from .patterns import compile_patterns, matches_patterns
+
+
+class TestCompilePatterns(unittest.TestCase):
+    def test_globs_are_full_matches(self):
+        self.assertTrue(matches_patterns("notes.md", ["*.md"]))
+        self.assertFalse(matches_patterns("notes.md.bak", ["*.md"]))
+
+    def test_regex_keeps_match_semantics(self):
+        self.assertTrue(matches_patterns("test_utils.py", ["regex:test_"]))
+        self.assertFalse(matches_patterns("utils_test.py", ["regex:test_"]))
+
+    def test_invalid_regex_is_dropped(self):
+        with self.assertLogs(level="ERROR"):
+            self.assertTrue(matches_patterns("a.py", ["regex:(", "*.py"]))
+
+    def test_global_inline_flags(self):
+        patterns = ["*.py", "regex:(?i)readme.*"]
+        self.assertTrue(matches_patterns("README.md", patterns))
+        self.assertTrue(matches_patterns("setup.py", patterns))
+        # The flag must not leak into the other patterns
+        self.assertFalse(matches_patterns("SETUP.PY", patterns))
+
+    def test_repeated_group_names(self):
+        patterns = ["regex:(?P<n>a)", "regex:(?P<n>b)"]
+        self.assertTrue(matches_patterns("a", patterns))
+        self.assertTrue(matches_patterns("b", patterns))
+        self.assertFalse(matches_patterns("c", patterns))
+
+    def test_numbered_backreferences(self):
+        patterns = ["regex:(a)b", r"regex:(x)\1"]
+        self.assertTrue(matches_patterns("ab", patterns))
+        self.assertTrue(matches_patterns("xx", patterns))
+        self.assertFalse(matches_patterns("xy", patterns))
+
+    def test_glob_case_follows_the_platform(self):
+        self.addCleanup(compile_patterns.cache_clear)
+        for case_insensitive in (False, True):
+            compile_patterns.cache_clear()
+            with self.subTest(case_insensitive=case_insensitive), mock.patch.object(
+                patterns_module, "_CASE_INSENSITIVE_GLOBS", case_insensitive
+            ):
+                self.assertEqual(
+                    matches_patterns("x.pyc", ["*.PYC", "regex:build"]), case_insensitive
+                )
+                self.assertTrue(matches_patterns("X.PYC", ["*.PYC", "regex:build"]))
+                self.assertFalse(matches_patterns("BUILD", ["*.PYC", "regex:build"]))
+
+    def test_no_patterns(self):
+        self.assertIsNone(compile_patterns(()))
+        self.assertFalse(matches_patterns("a.py", []))
+
+
+@unittest.skipIf(patterns_module.hyperscan is None, "hyperscan is not installed")
+class TestHyperscanMatcher(unittest.TestCase):
+    PATTERNS = ["*.md", "?.txt", "data_[0-9]*", "regex:build", r"regex:\w+\.log"]
+    NAMES = [
+        "README.md", "a.txt", "ä.txt", "日.txt", "ab.txt", "data_1.csv",
+        "data_x", "build", "builder", "rebuild", "ünï.log", "x.log.1",
+        "caf\u00e9.md", "bad\udcff.md", "bad\udcff.txt", "",
+    ]
+
+    def test_agrees_with_re(self):
+        sources = [patterns_module._pattern_to_regex(p) for p in self.PATTERNS]
+        fused = re.compile("|".join(f"(?:{source})" for source in sources))
+        matcher = patterns_module.HyperscanMatcher(sources, fused)
+        for name in self.NAMES:
+            with self.subTest(name=name):
+                self.assertEqual(matcher.match(name), fused.match(name) is not None)
+
+
+if __name__ == "__main__":
+    unittest.main()
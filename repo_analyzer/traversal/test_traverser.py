@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import repo_analyzer.core  # noqa: F401  (imports the traverser without a cycle)
+from .traverser import traverse_and_collect
+
+
+class TestOnlyDirs(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = Path(self.tmp_dir.name).resolve()
+        for name in (
+            "top.py",
+            "src/main.py",
+            "src/pkg/mod.py",
+            "src/pkg/deep/leaf.py",
+            "docs/index.md",
+            "other/skip.py",
+        ):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+
+    def collect(self, *only_dirs):
+        paths, included, _ = traverse_and_collect(
+            self.root, set(), set(), None, False, frozenset(only_dirs)
+        )
+        self.assertEqual(included, len(paths))
+        return sorted(p.relative_to(self.root).as_posix() for p in paths)
+
+    def test_without_only_dirs_everything_is_collected(self):
+        self.assertEqual(len(self.collect()), 6)
+
+    def test_in_scope_directory_is_collected_recursively(self):
+        self.assertEqual(
+            self.collect("src"),
+            ["src/main.py", "src/pkg/deep/leaf.py", "src/pkg/mod.py"],
+        )
+
+    def test_nested_directory_skips_its_parents_files(self):
+        self.assertEqual(
+            self.collect("src/pkg/deep", "docs"),
+            ["docs/index.md", "src/pkg/deep/leaf.py"],
+        )
+
+    def test_directory_that_does_not_exist_collects_nothing(self):
+        self.assertEqual(self.collect("missing"), [])
+
+    def test_prefix_of_a_directory_name_is_not_in_scope(self):
+        self.assertEqual(self.collect("sr"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,120 +1,142 @@
 # repo_analyzer/traversal/traverser.py
 
 import logging
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple, Optional, Generator
+from typing import Any, Dict, FrozenSet, List, Set, Tuple, Optional, Generator
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 from tqdm import tqdm
 
 from repo_analyzer.processing.file_processor import process_file
-from repo_analyzer.traversal.patterns import matches_patterns
+from repo_analyzer.traversal.patterns import PatternMatcher
 from colorama import Fore, Style
 
 from repo_analyzer.core.flags import shutdown_event
+from repo_analyzer.core.run_config import RunConfig
 
 def traverse_and_collect(
     root_dir: Path,
     excluded_folders: Set[str],
     excluded_files: Set[str],
-    exclude_patterns: List[str],
-    follow_symlinks: bool
+    exclude_re: Optional[PatternMatcher],
+    follow_symlinks: bool,
+    only_dirs: FrozenSet[str] = frozenset(),
 ) -> Tuple[List[Path], int, int]:
     paths: List[Path] = []
     included = 0
     excluded = 0
-    visited_paths: Set[Path] = set()
+    visited_paths: Set[str] = set()
+
+    # The walk works on plain strings and os.scandir entries, whose type
+    # checks reuse the directory listing instead of a stat() per entry;
+    # only the collected files are turned into Path objects.
+    root_str = os.fspath(root_dir)
+    root_prefix_len = len(os.path.join(root_str, ''))
 
-    stack = [root_dir]
+    # Each entry carries whether the directory lies inside the --only-dirs scope;
+    # directories outside it are only entered on the way to a scoped directory.
+    stack: List[Tuple[str, bool]] = [(root_str, not only_dirs)]
 
     while stack:
         if shutdown_event.is_set():
             logging.info("Traversal aborted due to shutdown event.")
             break
 
-        current_dir = stack.pop()
+        current_dir, in_scope = stack.pop()
         try:
             if follow_symlinks:
-                resolved_dir = current_dir.resolve()
+                resolved_dir = os.path.realpath(current_dir)
                 if resolved_dir in visited_paths:
                     logging.warning(
-                        f"{Fore.RED}Circular symbolic link found: {current_dir}{Style.RESET_ALL}"
+                        "%sCircular symbolic link found: %s%s", Fore.RED, current_dir, Style.RESET_ALL
                     )
                     continue
                 visited_paths.add(resolved_dir)
         except Exception as e:
             logging.error(
-                f"{Fore.RED}Error when resolving {current_dir}: {e}{Style.RESET_ALL}"
+                "%sError when resolving %s: %s%s", Fore.RED, current_dir, e, Style.RESET_ALL
             )
             continue
 
         try:
-            for entry in current_dir.iterdir():
-                if shutdown_event.is_set():
-                    logging.info("Traversal aborted due to shutdown event.")
-                    break
-
-                if entry.is_dir():
-                    if (
-                        entry.name in excluded_folders
-                        or matches_patterns(entry.name, exclude_patterns)
-                    ):
-                        logging.debug(
-                            f"{Fore.CYAN}Exclude folders: {entry}{Style.RESET_ALL}"
-                        )
-                        continue
-                    stack.append(entry)
-                elif entry.is_file():
-                    if (
-                        entry.name in excluded_files
-                        or matches_patterns(entry.name, exclude_patterns)
-                    ):
-                        logging.debug(
-                            f"{Fore.YELLOW}Exclude file: {entry}{Style.RESET_ALL}"
-                        )
-                        excluded += 1
-                        continue
-                    paths.append(entry)
-                    included += 1
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if shutdown_event.is_set():
+                        logging.info("Traversal aborted due to shutdown event.")
+                        break
+
+                    name = entry.name
+                    if entry.is_dir():
+                        if (
+                            name in excluded_folders
+                            or (exclude_re is not None and exclude_re.match(name))
+                        ):
+                            logging.debug(
+                                "%sExclude folders: %s%s", Fore.CYAN, entry.path, Style.RESET_ALL
+                            )
+                            continue
+                        if in_scope:
+                            stack.append((entry.path, True))
+                            continue
+                        relative = entry.path[root_prefix_len:].replace(os.sep, '/')
+                        if relative in only_dirs:
+                            stack.append((entry.path, True))
+                        elif any(d.startswith(relative + '/') for d in only_dirs):
+                            stack.append((entry.path, False))
+                        else:
+                            logging.debug("Outside of --only-dirs: %s", entry.path)
+                    elif entry.is_file():
+                        if not in_scope:
+                            continue
+                        if (
+                            name in excluded_files
+                            or (exclude_re is not None and exclude_re.match(name))
+                        ):
+                            logging.debug(
+                                "%sExclude file: %s%s", Fore.YELLOW, entry.path, Style.RESET_ALL
+                            )
+                            excluded += 1
+                            continue
+                        paths.append(Path(entry.path))
+                        included += 1
         except PermissionError as e:
             logging.warning(
-                f"{Fore.YELLOW}Could not read directory: {current_dir} - {e}{Style.RESET_ALL}"
+                "%sCould not read directory: %s - %s%s", Fore.YELLOW, current_dir, e, Style.RESET_ALL
             )
         except Exception as e:
             logging.error(
-                f"{Fore.RED}Errors when passing through {current_dir}: {e}{Style.RESET_ALL}"
+                "%sErrors when passing through %s: %s%s", Fore.RED, current_dir, e, Style.RESET_ALL
             )
 
     return paths, included, excluded
 
 def get_directory_structure(
-    root_dir: Path,
-    max_file_size: int,
-    include_binary: bool,
-    excluded_folders: Set[str],
-    excluded_files: Set[str],
-    follow_symlinks: bool,
-    image_extensions: Set[str],
-    exclude_patterns: List[str],
-    threads: int,
-    encoding: str = 'utf-8',
-    hash_algorithm: Optional[str] = "md5",
+    run_config: RunConfig,
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    root_dir = run_config.root_directory
+    max_file_size = run_config.max_file_size
+    include_binary = run_config.include_binary
+    image_extensions = run_config.image_extensions
+    threads = run_config.threads
+    encoding = run_config.encoding
+    hash_algorithm = run_config.hash_algorithm
 
     dir_structure: Dict[str, Any] = {}
 
     files_to_process, included_files, excluded_files_count = traverse_and_collect(
         root_dir,
-        excluded_folders,
-        excluded_files,
-        exclude_patterns,
-        follow_symlinks
+        run_config.excluded_folders,
+        run_config.excluded_files,
+        run_config.exclude_re,
+        run_config.follow_symlinks,
+        run_config.only_dirs,
     )
     total_files: int = included_files + excluded_files_count
     excluded_percentage: float = (excluded_files_count / total_files * 100) if total_files else 0.0
 
-    logging.info(f"Total number of files: {total_files}")
-    logging.info(f"Excluded files: {excluded_files_count} ({excluded_percentage:.2f}%)")
-    logging.info(f"Processed files: {included_files}")
+    logging.info("Total number of files: %s", total_files)
+    logging.info("Excluded files: %s (%.2f%%)", excluded_files_count, excluded_percentage)
+    logging.info("Processed files: %s", included_files)
     
     pbar: tqdm = tqdm(
         total=included_files,
@@ -147,7 +169,7 @@ def get_directory_structure(
             pbar.close()
             raise
         except Exception as e:
-            logging.error(f"Unexpected error during submission of tasks: {e}")
+            logging.error("Unexpected error during submission of tasks: %s", e)
             executor.shutdown(wait=False, cancel_futures=True)
             pbar.close()
             raise
@@ -184,7 +206,7 @@ def get_directory_structure(
                         "type": "error",
                         "content": f"Errors during processing: {str(e)}"
                     }
-                    logging.error(f"Error when processing the file {file_path}: {e}")
+                    logging.error("Error when processing the file %s: %s", file_path, e)
                     failed_files.append(
                         {"file": str(file_path), "error": str(e)}
                     )
@@ -210,40 +232,38 @@ def get_directory_structure(
         summary["hash_algorithm"] = hash_algorithm
 
     logging.info("Summary:")
-    logging.info(f"  Processed files: {included_files}")
-    logging.info(f"  Excluded files: {excluded_files_count} ({excluded_percentage:.2f}%)")
-    logging.info(f"  Failed files: {len(failed_files)}")
+    logging.info("  Processed files: %s", included_files)
+    logging.info("  Excluded files: %s (%.2f%%)", excluded_files_count, excluded_percentage)
+    logging.info("  Failed files: %s", len(failed_files))
     if hash_algorithm is not None:
-        logging.info(f"  Hash algorithm used: {hash_algorithm}")
+        logging.info("  Hash algorithm used: %s", hash_algorithm)
 
     return dir_structure, summary
 
 def get_directory_structure_stream(
-    root_dir: Path,
-    max_file_size: int,
-    include_binary: bool,
-    excluded_folders: Set[str],
-    excluded_files: Set[str],
-    follow_symlinks: bool,
-    image_extensions: Set[str],
-    exclude_patterns: List[str],
-    threads: int,
-    encoding: str = 'utf-8',
-    hash_algorithm: Optional[str] = "md5",
+    run_config: RunConfig,
 ) -> Generator[Dict[str, Any], None, None]:
+    root_dir = run_config.root_directory
+    max_file_size = run_config.max_file_size
+    include_binary = run_config.include_binary
+    image_extensions = run_config.image_extensions
+    threads = run_config.threads
+    encoding = run_config.encoding
+    hash_algorithm = run_config.hash_algorithm
     files_to_process, included_files, excluded_files_count = traverse_and_collect(
         root_dir,
-        excluded_folders,
-        excluded_files,
-        exclude_patterns,
-        follow_symlinks
+        run_config.excluded_folders,
+        run_config.excluded_files,
+        run_config.exclude_re,
+        run_config.follow_symlinks,
+        run_config.only_dirs,
     )
     total_files: int = included_files + excluded_files_count
     excluded_percentage: float = (excluded_files_count / total_files * 100) if total_files else 0.0
 
-    logging.info(f"Total number of files: {total_files}")
-    logging.info(f"Excluded files: {excluded_files_count} ({excluded_percentage:.2f}%)")
-    logging.info(f"Processed files: {included_files}")
+    logging.info("Total number of files: %s", total_files)
+    logging.info("Excluded files: %s (%.2f%%)", excluded_files_count, excluded_percentage)
+    logging.info("Processed files: %s", included_files)
     
     pbar: tqdm = tqdm(
         total=included_files,
@@ -289,7 +309,7 @@ def get_directory_structure_stream(
                             "info": file_info
                         }
                 except Exception as e:
-                    logging.error(f"Error when processing the file {file_path}: {e}")
+                    logging.error("Error when processing the file %s: %s", file_path, e)
                     yield {
                         "parent": str(file_path.parent.relative_to(root_dir)) if root_dir in file_path.parent.resolve().parents else str(file_path.parent),
                         "filename": file_path.name,
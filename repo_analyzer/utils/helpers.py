@@ -1,6 +1,7 @@
 # repo_analyzer/utils/helpers.py
 
 import logging
+import os
 from colorama import Fore, Style
 from pathlib import Path
 
@@ -19,3 +20,17 @@ def is_binary_alternative(file_path: Path) -> bool:
     except Exception as e:
         logging.error(f"{Fore.RED}Error during alternative binary check for {file_path}: {e}{Style.RESET_ALL}")
         return False
+
+
+def usable_cpu_count() -> int:
+    """
+    Returns the number of CPUs this process may run on.
+
+    Honours the affinity mask (e.g. container CPU pinning) where the platform
+    exposes it and falls back to the total CPU count elsewhere.
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        # sched_getaffinity is not available on every platform (e.g. macOS, Windows)
+        return os.cpu_count() or 1
@@ -25,7 +25,13 @@ extras_require = {
         'isort>=5.12.0',
         'mypy>=1.4.1',
         'flake8>=6.1.0',
-    ]
+    ],
+    # Optional accelerators, picked up automatically when installed
+    'speedups': [
+        'orjson>=3.9.0',
+        'msgspec>=0.18.0',
+        'hyperscan>=0.4.0; platform_system != "Windows"',
+    ],
 }
 
 setup(